@@ -0,0 +1,96 @@
+# =============================================================================
+# Comparación de motores de Transformaciones (pandas vs Polars)
+# Verifica que ambos motores generan la misma salida silver y mide sus tiempos.
+#
+# Uso:
+#   python benchmark_motores.py            -> usa data/raw/*.csv si existen
+#   python benchmark_motores.py --filas N  -> datos sintéticos de N filas
+# =============================================================================
+
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from transformaciones import Transformaciones
+
+
+def datos_sinteticos(filas, semilla=0):
+    """Genera DataFrames con la misma forma que los CSV crudos de listings y calendar."""
+    rng = np.random.default_rng(semilla)
+    n_listings = max(filas // 100, 10)
+
+    listings = pd.DataFrame({
+        "id": np.arange(n_listings),
+        "host_acceptance_rate": rng.choice(["100%", "95%", "80%", None], n_listings),
+        "host_response_rate": rng.choice(["100%", "90%", None], n_listings),
+        "host_response_time": rng.choice(["within an hour", "within a day", "a few days or more", None], n_listings),
+        "host_verifications": rng.choice(["['email', 'phone']", "['phone']", "[]"], n_listings),
+        "price": [f"${p:,.2f}" for p in rng.uniform(200, 20000, n_listings)],
+        "neighbourhood": rng.choice(["Cuauhtémoc", "Coyoacán", None], n_listings),
+        "bathrooms": rng.choice([1.0, 1.5, 2.0, 20.0, np.nan], n_listings),
+        "bedrooms": rng.choice([1.0, 2.0, 3.0, np.nan], n_listings),
+        "beds": rng.choice([1.0, 2.0, 16.0], n_listings),
+        "amenities": rng.choice(["Wifi, Kitchen", "Wifi, TV, Washer", "Kitchen"], n_listings),
+    })
+
+    fechas = pd.date_range("2025-06-25", periods=365).strftime("%Y-%m-%d")
+    calendar = pd.DataFrame({
+        "listing_id": rng.integers(0, n_listings, filas),
+        "date": rng.choice(fechas, filas),
+        "available": rng.choice(["t", "f"], filas),
+        "price": rng.choice(["$1,200.00", "$850.00", None], filas),
+        "minimum_nights": rng.integers(1, 5, filas),
+        "maximum_nights": rng.integers(30, 365, filas),
+    })
+    return listings, calendar
+
+
+def cargar_datos(filas):
+    """Lee los CSV crudos si existen; si no, genera datos sintéticos."""
+    raw_dir = os.path.join(os.path.dirname(__file__), "..", "data", "raw")
+    listings_csv = os.path.join(raw_dir, "listings.csv")
+    calendar_csv = os.path.join(raw_dir, "calendar.csv")
+    if filas is None and os.path.exists(listings_csv) and os.path.exists(calendar_csv):
+        print(f"Usando datos crudos de {raw_dir}")
+        return (
+            pd.read_csv(listings_csv, sep=",", encoding="utf-8-sig"),
+            pd.read_csv(calendar_csv, sep=",", encoding="utf-8-sig"),
+        )
+    filas = filas or 1_000_000
+    print(f"Usando datos sintéticos ({filas} filas de calendar)")
+    return datos_sinteticos(filas)
+
+
+def medir(funcion, df, repeticiones):
+    """Ejecuta la transformación varias veces y retorna (mejor tiempo, resultado)."""
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(df)
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Paridad y rendimiento de los motores de Transformaciones.")
+    parser.add_argument("--filas", type=int, default=None, help="Filas sintéticas de calendar.")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    df_listings, df_calendar = cargar_datos(args.filas)
+    transf = {nombre: Transformaciones(motor=nombre) for nombre in ["pandas", "polars"]}
+
+    for etapa, df in [("listings", df_listings), ("calendar", df_calendar)]:
+        resultados = {}
+        for nombre, t in transf.items():
+            funcion = getattr(t, f"transformaciones_{etapa}")
+            segundos, resultados[nombre] = medir(funcion, df, args.repeticiones)
+            print(f"{etapa:<10} {nombre:<8} {segundos:8.3f} s  ({len(resultados[nombre])} filas)")
+
+        # Paridad: misma salida silver (valores, columnas e índice)
+        pd.testing.assert_frame_equal(
+            resultados["pandas"], resultados["polars"], check_exact=False
+        )
+        print(f"{etapa:<10} paridad OK")
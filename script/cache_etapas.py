@@ -0,0 +1,239 @@
+import os
+import json
+import hashlib
+import inspect
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from logs_bi import Logs
+
+
+def restaurar_columnas(df):
+    """
+    Deshace los cambios de tipo que produce el viaje de ida y vuelta por Parquet en
+    columnas object: las listas vuelven como np.ndarray y los nulos como None.
+    Se restauran listas y NaN para que el DataFrame (y su texto al cargar en SQL)
+    sea el mismo que antes de guardarlo.
+    """
+    for col in df.columns[df.dtypes == object]:
+        serie = df[col]
+        if serie.map(lambda v: isinstance(v, np.ndarray)).any():
+            serie = serie.map(lambda v: v.tolist() if isinstance(v, np.ndarray) else v)
+        df[col] = serie.where(serie.notna(), np.nan)
+    return df
+
+
+def identidad_parametro(valor):
+    """
+    Representación estable de un parámetro de etapa para la clave de caché.
+    - Funciones (ej. puntuadores): módulo, nombre calificado y hash de su código fuente.
+    - Objetos con __repr__ propio (ej. DetectorIdioma): su repr.
+    - Otros objetos: el nombre de su clase (el repr por defecto incluye la dirección
+      de memoria y cambiaría en cada proceso).
+    """
+    if callable(valor) and hasattr(valor, "__qualname__"):
+        try:
+            fuente = hashlib.sha256(inspect.getsource(valor).encode("utf-8")).hexdigest()[:16]
+        except (OSError, TypeError):
+            fuente = ""
+        return f"{getattr(valor, '__module__', '')}.{valor.__qualname__}:{fuente}"
+    if type(valor).__repr__ is not object.__repr__:
+        return repr(valor)
+    return f"{type(valor).__module__}.{type(valor).__qualname__}"
+
+
+class CacheEtapas:
+    """
+    Caché direccionada por contenido para las etapas de Transformaciones.
+
+    Cada resultado se identifica con un hash calculado a partir de:
+    - El contenido del DataFrame de entrada.
+    - El código fuente de la función de transformación (versión del código) y, si la
+      función es un método de un objeto con `version_cache()`, la versión que este declara
+      (ej. Transformaciones: motor, reglas y módulos de los que dependen las etapas).
+    - Los parámetros adicionales con los que se invoca la etapa (ver identidad_parametro).
+
+    Los resultados se guardan como archivos Parquet en `data/cache` y se
+    eliminan por antigüedad de uso (LRU) cuando la carpeta supera el tamaño máximo.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=2 * 1024 ** 3, logs_dir=None):
+        """
+        Constructor de la clase CacheEtapas.
+
+        Parámetros:
+        -----------
+        cache_dir : str, opcional
+            Carpeta donde se guardan los resultados (por defecto: ../data/cache).
+        max_bytes : int, opcional
+            Tamaño máximo de la caché en bytes (por defecto: 2 GB).
+        logs_dir : str, opcional
+            Carpeta de logs (por defecto: ../logs).
+        """
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(__file__), "..", "data", "cache")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Crear archivo de log con timestamp único
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if logs_dir is None:
+            logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+        os.makedirs(logs_dir, exist_ok=True)
+        log_filename = f"logs_{timestamp}.txt"
+        self.log = Logs(os.path.join(logs_dir, log_filename))
+
+        self.log.info(f"[INIT] - Clase CacheEtapas inicializada en {self.cache_dir} (máximo {self.max_bytes} bytes).")
+
+    def _hash_dataframe(self, df):
+        """
+        Calcula un hash estable del contenido de un DataFrame
+        (columnas, tipos de datos y valores).
+        """
+        h = hashlib.sha256()
+        h.update(json.dumps([str(c) for c in df.columns]).encode("utf-8"))
+        h.update(json.dumps([str(t) for t in df.dtypes]).encode("utf-8"))
+        try:
+            valores = pd.util.hash_pandas_object(df, index=True).values
+        except TypeError:
+            # Columnas con objetos no hashables (listas, dicts): se usa su representación en texto
+            valores = pd.util.hash_pandas_object(df.astype(str), index=True).values
+        h.update(valores.tobytes())
+        return h.hexdigest()
+
+    def _hash_codigo(self, funcion):
+        """
+        Calcula un hash del código fuente de la función de transformación
+        y de la versión de sus dependencias (ver `version_cache`).
+        """
+        try:
+            fuente = inspect.getsource(funcion)
+        except (OSError, TypeError):
+            fuente = getattr(funcion, "__qualname__", repr(funcion))
+        version = getattr(getattr(funcion, "__self__", None), "version_cache", None)
+        if callable(version):
+            fuente += version()
+        return hashlib.sha256(fuente.encode("utf-8")).hexdigest()
+
+    def clave(self, funcion, df, **params):
+        """
+        Construye la clave de caché de una etapa.
+
+        Parámetros:
+        -----------
+        funcion : callable
+            Función de transformación (por ejemplo transf.transformaciones_listings).
+        df : pd.DataFrame
+            DataFrame de entrada de la etapa.
+        **params :
+            Parámetros adicionales de la etapa.
+
+        Retorna:
+        --------
+        str -> Clave hexadecimal que identifica el resultado.
+        """
+        h = hashlib.sha256()
+        h.update(getattr(funcion, "__name__", "etapa").encode("utf-8"))
+        h.update(self._hash_codigo(funcion).encode("utf-8"))
+        h.update(json.dumps(params, sort_keys=True, default=identidad_parametro).encode("utf-8"))
+        h.update(self._hash_dataframe(df).encode("utf-8"))
+        return h.hexdigest()
+
+    def _ruta(self, nombre_etapa, clave):
+        """Ruta del archivo Parquet asociado a una clave."""
+        return os.path.join(self.cache_dir, f"{nombre_etapa}_{clave[:32]}.parquet")
+
+    def ejecutar(self, funcion, df, ejecutor=None, **params):
+        """
+        Ejecuta una etapa de transformación utilizando la caché.
+        Si el resultado ya existe se lee desde Parquet; si no, se calcula y se guarda.
+
+        Parámetros:
+        -----------
+        funcion : callable
+            Función de transformación que recibe el DataFrame y los parámetros.
+        df : pd.DataFrame
+            DataFrame de entrada.
+        ejecutor : callable, opcional
+            Si se indica, calcula la etapa en lugar de llamar a la función directamente:
+            ejecutor(funcion, df, **params) (ej. en un pool de procesos, ver main.ejecutor_en_pool).
+            No forma parte de la clave.
+        **params :
+            Parámetros adicionales que se pasan a la función y forman parte de la clave.
+
+        Retorna:
+        --------
+        pd.DataFrame -> Resultado de la etapa.
+        """
+        nombre_etapa = getattr(funcion, "__name__", "etapa")
+        clave = self.clave(funcion, df, **params)
+        ruta = self._ruta(nombre_etapa, clave)
+
+        if os.path.exists(ruta):
+            try:
+                df_resultado = restaurar_columnas(pd.read_parquet(ruta))
+                # Actualizar la fecha de uso para la política LRU
+                os.utime(ruta, None)
+                self.log.info(f"[CACHE] - Acierto para '{nombre_etapa}' ({clave[:12]}). Resultado leído desde {ruta}.")
+                return df_resultado
+            except Exception as e:
+                self.log.error(f"[CACHE] - Error al leer {ruta}, se recalculará la etapa: {type(e).__name__} - {e}")
+
+        self.log.info(f"[CACHE] - Fallo para '{nombre_etapa}' ({clave[:12]}). Ejecutando transformación...")
+        df_resultado = ejecutor(funcion, df, **params) if ejecutor else funcion(df, **params)
+        self._guardar(df_resultado, ruta, nombre_etapa)
+        return df_resultado
+
+    def _guardar(self, df, ruta, nombre_etapa):
+        """Guarda el resultado en Parquet y aplica la política de eliminación LRU."""
+        ruta_tmp = f"{ruta}.tmp"
+        try:
+            df.to_parquet(ruta_tmp, index=True)
+            # Reemplazo atómico para no dejar archivos incompletos en la caché
+            os.replace(ruta_tmp, ruta)
+            self.log.info(f"[CACHE] - Resultado de '{nombre_etapa}' guardado en {ruta}.")
+        except Exception as e:
+            self.log.error(f"[CACHE] - No se pudo guardar el resultado de '{nombre_etapa}': {type(e).__name__} - {e}")
+            if os.path.exists(ruta_tmp):
+                os.remove(ruta_tmp)
+            return
+        self._evict()
+
+    def _evict(self):
+        """Elimina los archivos menos usados recientemente hasta respetar el tamaño máximo."""
+        archivos = []
+        for nombre in os.listdir(self.cache_dir):
+            if not nombre.endswith(".parquet"):
+                continue
+            ruta = os.path.join(self.cache_dir, nombre)
+            try:
+                stat = os.stat(ruta)
+            except FileNotFoundError:
+                # Otra ejecución (ej. otra ciudad) lo eliminó entre listdir y stat
+                continue
+            archivos.append((stat.st_mtime, stat.st_size, ruta))
+
+        total = sum(size for _, size, _ in archivos)
+        # Ordenar del uso más antiguo al más reciente
+        for _, size, ruta in sorted(archivos):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(ruta)
+                total -= size
+                self.log.info(f"[CACHE] - Archivo eliminado por política LRU: {ruta}")
+            except FileNotFoundError:
+                total -= size
+            except OSError as e:
+                self.log.error(f"[CACHE] - Error al eliminar {ruta}: {type(e).__name__} - {e}")
+
+    def limpiar(self):
+        """Elimina todos los resultados almacenados en la caché."""
+        for nombre in os.listdir(self.cache_dir):
+            if nombre.endswith(".parquet"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, nombre))
+                except FileNotFoundError:
+                    pass
+        self.log.info("[CACHE] - Caché vaciada completamente.")
@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+from motores import MotorPandas
+
+
+# Número de bits encendidos de cada byte (0-255), para contar noches por bytes empaquetados
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class CalendarioCompacto:
+    """
+    Representación compacta de calendar: una fila por listing y una columna por día.
+
+    - 'disponible' y 'presente' (el día existe en calendar) se guardan como bitsets
+      empaquetados con np.packbits: 1 bit por listing y día.
+    - El precio se guarda como un arreglo float32 listings x días (NaN si no hay dato).
+
+    Las consultas de noches en un rango se resuelven con un AND contra una máscara
+    empaquetada del rango y un conteo de bits por byte, sin recorrer filas.
+    Un año completo de una ciudad (~25.000 listings) ocupa ~2 MB de bitsets y ~37 MB de precios.
+    """
+
+    def __init__(self, listing_ids, fecha_inicio, disponible, presente, precios):
+        """
+        Constructor de la clase CalendarioCompacto (ver desde_largo para construirla desde un DataFrame).
+
+        Parámetros:
+        -----------
+        listing_ids : np.ndarray -> Ids de listing (texto), uno por fila.
+        fecha_inicio : pd.Timestamp -> Fecha de la primera columna (NaT si el calendario no tiene días).
+        disponible : np.ndarray -> Matriz booleana listings x días.
+        presente : np.ndarray -> Matriz booleana listings x días (el día existe en calendar).
+        precios : np.ndarray -> Matriz float32 listings x días.
+        """
+        self.listing_ids = np.asarray(listing_ids)
+        self.fecha_inicio = pd.Timestamp(fecha_inicio).normalize() if pd.notna(fecha_inicio) else pd.NaT
+        self.dias = disponible.shape[1]
+        self.bits_disponible = np.packbits(disponible, axis=1)
+        self.bits_presente = np.packbits(presente, axis=1)
+        self.precios = precios.astype(np.float32, copy=False)
+
+    @classmethod
+    def desde_largo(cls, df, fecha_inicio=None, fecha_fin=None):
+        """
+        Construye la forma compacta desde calendar en formato largo (una fila por listing y día).
+
+        Parámetros:
+        -----------
+        df : pd.DataFrame
+            Columnas 'listing_id', 'date', 'available' ('t'/'f' o booleano) y 'price'.
+            'date' se interpreta con el mismo formato que Transformaciones (ver motores.PATRON_FECHA).
+        fecha_inicio, fecha_fin : str | pd.Timestamp, opcional
+            Rango de días a representar (por defecto: mínimo y máximo de 'date').
+            Las filas fuera del rango se descartan. Sin fechas válidas (o con un rango
+            vacío) se obtiene un calendario sin días.
+
+        Retorna:
+        --------
+        CalendarioCompacto
+        """
+        fechas = MotorPandas().convertir_fecha(df, "date").dt.normalize()
+        validas = fechas.notna().to_numpy()
+        inicio = pd.Timestamp(fecha_inicio).normalize() if fecha_inicio is not None else fechas.min()
+        fin = pd.Timestamp(fecha_fin).normalize() if fecha_fin is not None else fechas.max()
+        if validas.any() and pd.notna(inicio) and pd.notna(fin):
+            dias = max(int((fin - inicio).days) + 1, 0)
+        else:
+            dias = 0
+
+        if dias > 0:
+            dia = ((fechas - inicio).dt.days).to_numpy(dtype="float64")
+            validas = validas & (dia >= 0) & (dia < dias)
+        else:
+            dia = np.zeros(len(df), dtype="float64")
+            validas = np.zeros(len(df), dtype=bool)
+
+        listing_ids, fila = np.unique(df["listing_id"].astype(str).to_numpy()[validas], return_inverse=True)
+        columna = dia[validas].astype(np.int64)
+
+        disponible = np.zeros((len(listing_ids), dias), dtype=bool)
+        presente = np.zeros((len(listing_ids), dias), dtype=bool)
+        precios = np.full((len(listing_ids), dias), np.nan, dtype=np.float32)
+
+        disponible[fila, columna] = df["available"].astype(str).str.lower().isin(["t", "true"]).to_numpy()[validas]
+        presente[fila, columna] = True
+        precio = pd.to_numeric(
+            df["price"].astype(str).str.replace("$", "", regex=False).str.replace(",", "", regex=False),
+            errors="coerce"
+        )
+        precios[fila, columna] = precio.to_numpy(dtype=np.float32)[validas]
+
+        return cls(listing_ids, inicio, disponible, presente, precios)
+
+    def a_largo(self):
+        """
+        Convierte a formato largo: una fila por listing y día presente.
+
+        Retorna:
+        --------
+        pd.DataFrame -> Columnas 'listing_id', 'date', 'available' ('t'/'f') y 'price'.
+        """
+        presente = np.unpackbits(self.bits_presente, axis=1, count=self.dias).astype(bool)
+        disponible = np.unpackbits(self.bits_disponible, axis=1, count=self.dias).astype(bool)
+        fila, columna = np.nonzero(presente)
+        return pd.DataFrame({
+            "listing_id": self.listing_ids[fila],
+            "date": self.fecha_inicio + pd.to_timedelta(columna, unit="D"),
+            "available": np.where(disponible[fila, columna], "t", "f"),
+            "price": self.precios[fila, columna].astype(np.float64),
+        })
+
+    def _rango_dias(self, fecha_ini, fecha_fin):
+        """
+        Columnas (inicio, fin inclusive) de un rango de fechas, recortadas al calendario.
+        Si el rango no se cruza con el calendario se retorna ini > fin.
+        """
+        if self.dias == 0:
+            return 0, -1
+        ini = max(int((pd.Timestamp(fecha_ini).normalize() - self.fecha_inicio).days), 0)
+        fin = min(int((pd.Timestamp(fecha_fin).normalize() - self.fecha_inicio).days), self.dias - 1)
+        return ini, fin
+
+    def _mascara_rango(self, fecha_ini, fecha_fin):
+        """Máscara empaquetada de los días entre fecha_ini y fecha_fin (inclusive)."""
+        ini, fin = self._rango_dias(fecha_ini, fecha_fin)
+        mascara = np.zeros(self.dias, dtype=bool)
+        if ini <= fin:
+            mascara[ini:fin + 1] = True
+        return np.packbits(mascara)
+
+    def _contar(self, bits, fecha_ini, fecha_fin):
+        """Cuenta por listing los bits encendidos dentro del rango de fechas."""
+        en_rango = bits & self._mascara_rango(fecha_ini, fecha_fin)
+        return _POPCOUNT[en_rango].sum(axis=1, dtype=np.int64)
+
+    def noches_disponibles(self, fecha_ini, fecha_fin):
+        """
+        Noches disponibles por listing entre dos fechas (inclusive).
+
+        Retorna:
+        --------
+        pd.Series -> Índice listing_id.
+        """
+        return pd.Series(self._contar(self.bits_disponible, fecha_ini, fecha_fin), index=self.listing_ids, name="noches_disponibles")
+
+    def ocupacion(self, fecha_ini, fecha_fin):
+        """
+        Noches totales, disponibles y ocupadas por listing entre dos fechas (inclusive).
+
+        Retorna:
+        --------
+        pd.DataFrame -> Índice listing_id; columnas noches_totales, noches_disponibles,
+                        noches_ocupadas y tasa_ocupacion.
+        """
+        totales = self._contar(self.bits_presente, fecha_ini, fecha_fin)
+        disponibles = self._contar(self.bits_disponible, fecha_ini, fecha_fin)
+        resultado = pd.DataFrame({
+            "noches_totales": totales,
+            "noches_disponibles": disponibles,
+            "noches_ocupadas": totales - disponibles,
+        }, index=pd.Index(self.listing_ids, name="listing_id"))
+        resultado["tasa_ocupacion"] = np.where(totales > 0, resultado["noches_ocupadas"] / np.maximum(totales, 1), np.nan)
+        return resultado
+
+    def precio_promedio(self, fecha_ini, fecha_fin):
+        """
+        Precio promedio por listing entre dos fechas (inclusive), ignorando días sin precio.
+        NaN para todos los listings si el rango no se cruza con el calendario.
+        """
+        ini, fin = self._rango_dias(fecha_ini, fecha_fin)
+        if ini > fin:
+            return pd.Series(np.nan, index=self.listing_ids, name="precio_promedio")
+        tramo = self.precios[:, ini:fin + 1]
+        conteo = np.sum(~np.isnan(tramo), axis=1)
+        suma = np.nansum(tramo, axis=1, dtype=np.float64)
+        return pd.Series(np.where(conteo > 0, suma / np.maximum(conteo, 1), np.nan), index=self.listing_ids, name="precio_promedio")
+
+    @property
+    def memoria_bytes(self):
+        """Memoria ocupada por los bitsets y el arreglo de precios."""
+        return self.bits_disponible.nbytes + self.bits_presente.nbytes + self.precios.nbytes
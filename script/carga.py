@@ -5,17 +5,26 @@ from logs_bi import Logs
 import pandas as pd
 
 class Cargas:
-    def __init__(self):
+    def __init__(self, data_dir=None, logs_dir=None):
         """
         Constructor de la clase Cargas.
         Inicializa un objeto para manejar cargas de datos y crea un archivo de log 
         único basado en la fecha y hora de ejecución.
+
+        Parámetros:
+        data_dir (str, opcional): Carpeta base de datos; los archivos silver se guardan en `data_dir/silver` (por defecto: ../data).
+        logs_dir (str, opcional): Carpeta de logs (por defecto: ../logs).
         """
+        if data_dir is None:
+            data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+        self.data_dir = data_dir
+
         # Generar marca de tiempo para el nombre del log (formato: AAAAMMDD_HHMMSS)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Definir el directorio donde se guardarán los logs (../logs)
-        logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+        # Definir el directorio donde se guardarán los logs (../logs por defecto)
+        if logs_dir is None:
+            logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
         os.makedirs(logs_dir, exist_ok=True)  # Crear carpeta si no existe
         
         # Crear nombre de archivo de log con la marca de tiempo
@@ -39,12 +48,9 @@ class Cargas:
             # Log de inicio del proceso de carga
             self.log.info(f"[LOAD] - Iniciando carga del archivo {file_name}.xlsx en carpeta silver...")
 
-            # Obtener ruta base del script actual
-            base_dir = os.path.dirname(__file__)
-            # Obtener el directorio padre (nivel superior al script actual)
-            parent_dir = os.path.dirname(base_dir)
             # Construir la ruta hacia la carpeta 'silver'
-            silver_dir = os.path.join(parent_dir, "data", "silver")
+            silver_dir = os.path.join(self.data_dir, "silver")
+            os.makedirs(silver_dir, exist_ok=True)
             # Definir la ruta completa del archivo a guardar
             xlsx_path = os.path.join(silver_dir, f"{file_name}.xlsx")
 
@@ -57,6 +63,41 @@ class Cargas:
         except Exception as e:
             # En caso de error, registrar el mensaje en el log
             self.log.error(f"[ERROR] - Error al guardar el archivo {file_name}.xlsx: {str(e)}")
+
+        # Copia columnar para recargar SQL sin repetir extracción y transformación (ver recarga.py)
+        self.cargar_silver_parquet(df, file_name)
+
+    def cargar_silver_parquet(self, df, file_name):
+        """
+        Guarda un DataFrame en formato .parquet dentro de la carpeta 'silver'.
+        Las columnas de texto con tipos mixtos se guardan como texto, igual que se insertan en SQL
+        (los nulos se conservan como nulos).
+
+        Parámetros:
+        df (pd.DataFrame): DataFrame a guardar.
+        file_name (str): Nombre del archivo (sin extensión).
+        """
+        silver_dir = os.path.join(self.data_dir, "silver")
+        os.makedirs(silver_dir, exist_ok=True)
+        parquet_path = os.path.join(silver_dir, f"{file_name}.parquet")
+        tmp_path = f"{parquet_path}.tmp"
+
+        try:
+            try:
+                df.to_parquet(tmp_path, index=False)
+            except (TypeError, ValueError) as e:
+                # pyarrow no admite columnas object con tipos mixtos (ej. números y texto)
+                self.log.info(f"[LOAD] - {file_name}: columnas de texto con tipos mixtos, se guardan como texto ({type(e).__name__}).")
+                cols_obj = df.select_dtypes(include="object").columns
+                df.assign(**{c: df[c].where(df[c].isna(), df[c].astype(str)) for c in cols_obj}).to_parquet(tmp_path, index=False)
+            # Reemplazo atómico para no dejar un silver incompleto
+            os.replace(tmp_path, parquet_path)
+            self.log.info(f"[LOAD] - Archivo {file_name}.parquet guardado exitosamente en {parquet_path}.")
+
+        except Exception as e:
+            self.log.error(f"[ERROR] - Error al guardar el archivo {file_name}.parquet: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
         
     def cargar_sql(self, df, name, schema, instance):
         """
@@ -0,0 +1,165 @@
+import os
+import argparse
+import pandas as pd
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from logs_bi import Logs
+
+
+class CargaMongo:
+    """
+    Carga masiva de los archivos .csv.gz de Inside Airbnb en MongoDB.
+
+    Lee cada archivo por bloques (sin cargarlo completo en memoria), convierte
+    los tipos (fechas reales, identificadores enteros) e inserta los documentos
+    con insert_many desordenado desde varios hilos que comparten el pool de
+    conexiones del cliente. Al final crea los índices declarados en DatabaseMongo.
+    """
+
+    # Columnas que se convierten a datetime para que get_range pueda filtrar por fecha
+    COLUMNAS_FECHA = ["date", "last_scraped", "calendar_last_scraped", "host_since", "first_review", "last_review"]
+
+    # Identificadores que se guardan como enteros
+    COLUMNAS_ID = ["id", "listing_id", "host_id", "reviewer_id", "scrape_id"]
+
+    def __init__(self, mongo_instance, chunksize=100000, lote_insercion=10000, workers=4):
+        """
+        Constructor de la clase CargaMongo.
+
+        Parámetros:
+        -----------
+        mongo_instance : DatabaseMongo
+            Instancia de conexión a MongoDB ya establecida.
+        chunksize : int, opcional
+            Filas leídas del archivo por bloque.
+        lote_insercion : int, opcional
+            Documentos por llamada a insert_many.
+        workers : int, opcional
+            Hilos de inserción en paralelo.
+        """
+        self.mongo = mongo_instance
+        self.chunksize = chunksize
+        self.lote_insercion = lote_insercion
+        self.workers = workers
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+        os.makedirs(logs_dir, exist_ok=True)
+        log_filename = f"logs_{timestamp}.txt"
+        self.log = Logs(os.path.join(logs_dir, log_filename))
+
+        self.log.info("[INIT] - Clase CargaMongo inicializada correctamente.")
+
+    def _convertir_tipos(self, df):
+        """Convierte fechas a datetime e identificadores a enteros."""
+        for col in self.COLUMNAS_FECHA:
+            if col in df.columns:
+                df[col] = pd.to_datetime(df[col], errors="coerce")
+        for col in self.COLUMNAS_ID:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+        return df
+
+    def _a_documentos(self, df):
+        """Convierte un bloque en documentos BSON-compatibles (nulos como None, tipos nativos de Python)."""
+        df = df.astype(object).where(df.notna(), None)
+        return df.to_dict("records")
+
+    def _insertar(self, collection, documentos):
+        """Inserta un lote sin orden; los errores de documentos individuales no detienen la carga."""
+        from pymongo.errors import BulkWriteError
+        try:
+            return len(collection.insert_many(documentos, ordered=False).inserted_ids)
+        except BulkWriteError as e:
+            self.log.error(f"[SEED] - Errores en lote de inserción: {len(e.details.get('writeErrors', []))} documentos rechazados.")
+            return e.details.get("nInserted", 0)
+
+    def cargar_archivo(self, db_name, collection_name, ruta, reemplazar=True):
+        """
+        Carga un archivo .csv.gz en una colección de MongoDB.
+
+        Parámetros:
+        -----------
+        db_name : str
+            Nombre de la base de datos (ej. 'bi_mx').
+        collection_name : str
+            Colección destino ('listings', 'calendar' o 'reviews').
+        ruta : str
+            Ruta del archivo .csv.gz (o .csv).
+        reemplazar : bool, opcional
+            Si es True, elimina la colección antes de cargar.
+
+        Retorna:
+        --------
+        int -> Número de documentos insertados.
+        """
+        if self.mongo.client is None:
+            error_msg = "[SEED] - No hay conexión activa. Llama primero a connect()."
+            self.log.error(error_msg)
+            raise Exception(error_msg)
+
+        inicio = datetime.now()
+        collection = self.mongo.client[db_name][collection_name]
+        if reemplazar:
+            collection.drop()
+            self.log.info(f"[SEED] - Colección {db_name}.{collection_name} eliminada para recarga completa.")
+
+        self.log.info(f"[SEED] - Iniciando carga de {ruta} en {db_name}.{collection_name}...")
+        insertados = 0
+        pendientes = set()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for n_bloque, bloque in enumerate(pd.read_csv(ruta, compression="infer", chunksize=self.chunksize, low_memory=False)):
+                documentos = self._a_documentos(self._convertir_tipos(bloque))
+                for i in range(0, len(documentos), self.lote_insercion):
+                    # Limitar los lotes en vuelo para acotar la memoria
+                    if len(pendientes) >= self.workers * 2:
+                        terminados, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                        insertados += sum(f.result() for f in terminados)
+                    pendientes.add(executor.submit(self._insertar, collection, documentos[i:i + self.lote_insercion]))
+                self.log.info(f"[SEED] - Bloque {n_bloque} leído ({len(bloque)} filas) de {collection_name}.")
+
+            insertados += sum(f.result() for f in pendientes)
+
+        segundos = (datetime.now() - inicio).total_seconds()
+        self.log.info(f"[SEED] - {insertados} documentos insertados en {db_name}.{collection_name} en {segundos:.1f} s.")
+
+        # Los índices se crean después de la carga: es más rápido que mantenerlos durante las inserciones
+        self.mongo.asegurar_indices(db_name, collection_name)
+        return insertados
+
+    def cargar_inside_airbnb(self, db_name, data_dir, colecciones=("listings", "calendar", "reviews")):
+        """
+        Carga los archivos {coleccion}.csv.gz de Inside Airbnb ubicados en `data_dir`.
+
+        Retorna:
+        --------
+        dict -> Documentos insertados por colección.
+        """
+        resultados = {}
+        for nombre in colecciones:
+            ruta = os.path.join(data_dir, f"{nombre}.csv.gz")
+            if not os.path.exists(ruta):
+                self.log.error(f"[SEED] - No se encontró el archivo {ruta}. Se omite la colección '{nombre}'.")
+                continue
+            resultados[nombre] = self.cargar_archivo(db_name, nombre, ruta)
+        return resultados
+
+
+if __name__ == "__main__":
+    from database import DatabaseMongo
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Carga masiva de los .csv.gz de Inside Airbnb en MongoDB.")
+    parser.add_argument("--db", default="bi_mx", help="Base de datos destino.")
+    parser.add_argument("--dir", default=os.path.join(os.path.dirname(__file__), "..", "data", "raw"),
+                        help="Carpeta con listings.csv.gz, calendar.csv.gz y reviews.csv.gz.")
+    parser.add_argument("--workers", type=int, default=4, help="Hilos de inserción en paralelo.")
+    args = parser.parse_args()
+
+    mongo = DatabaseMongo(uri=os.getenv("URL"), explicar_consultas=False)
+    mongo.connect()
+    CargaMongo(mongo, workers=args.workers).cargar_inside_airbnb(args.db, args.dir)
+    mongo.close()
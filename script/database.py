@@ -1,28 +1,62 @@
-from pymongo import MongoClient, errors
 import os
 from logs_bi import Logs
 from datetime import datetime
-import pyodbc
 import pandas as pd
 
+# pymongo y pyodbc se importan en connect(): una ejecución solo Mongo
+# o solo SQL no necesita cargar (ni tener instalado) el otro controlador.
+
 # ===========================================================
 # 🔹 Clase DatabaseMongo
 # Maneja la conexión, extracción y cierre de datos desde MongoDB.
 # ===========================================================
 class DatabaseMongo:
-    def __init__(self, uri="mongodb://localhost:27017/"):
+    # Índices requeridos por colección para las consultas de extracción.
+    # Cada índice se declara como una lista de pares (campo, dirección).
+    INDICES_REQUERIDOS = {
+        "listings": [
+            [("id", 1)],
+        ],
+        # Las consultas por listing_id usan el prefijo del índice compuesto (listing_id, date);
+        # un índice simple sobre listing_id solo agregaría costo de escritura y almacenamiento.
+        "calendar": [
+            [("date", 1)],
+            [("listing_id", 1), ("date", 1)],
+        ],
+        "reviews": [
+            [("date", 1)],
+            [("listing_id", 1)],
+        ],
+    }
+
+    def __init__(self, uri="mongodb://localhost:27017/", explicar_consultas=True, estadisticas_explain=False, logs_dir=None):
         """
         Constructor de la clase DatabaseMongo.
         Inicializa la conexión con MongoDB y prepara el sistema de logs.
+
+        Parámetros:
+        -----------
+        uri : str -> URI de conexión a MongoDB.
+        explicar_consultas : bool -> Si es True, se ejecuta explain() antes de cada extracción con filtro
+                             y se registra el plan (COLLSCAN / IXSCAN) en el log. Solo consulta al
+                             planificador (queryPlanner): no ejecuta la consulta.
+        estadisticas_explain : bool -> Si es True, explain() usa 'executionStats' y registra claves y
+                               documentos examinados. Ejecuta la consulta completa una vez más,
+                               por lo que solo conviene para diagnóstico.
+        logs_dir : str, opcional -> Carpeta de logs (por defecto: ../logs).
         """
         self.uri = uri
         self.client = None
+        self.explicar_consultas = explicar_consultas
+        self.estadisticas_explain = estadisticas_explain
 
         # Crear marca de tiempo (timestamp) para el archivo de logs
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         # Construir la ruta del archivo de log (../logs/logs_YYYYMMDD_HHMMSS.txt)
-        logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+        if logs_dir is None:
+            logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+        os.makedirs(logs_dir, exist_ok=True)
         log_filename = f"logs_{timestamp}.txt"
         log_path = os.path.join(logs_dir, log_filename)
 
@@ -34,6 +68,7 @@ class DatabaseMongo:
         """Establece la conexión con MongoDB."""
         try:
             self.log.info("[CONNECT] - Intentando conectar con MongoDB...")
+            from pymongo import MongoClient
             # Crear cliente de conexión con un tiempo de espera máximo de 3 segundos
             self.client = MongoClient(self.uri, serverSelectionTimeoutMS=3000)
             # Probar la conexión enviando un comando 'ping'
@@ -43,13 +78,24 @@ class DatabaseMongo:
             # Captura y registra cualquier error durante la conexión
             self.log.error(f"[CONNECT] - Error al conectar con MongoDB: {type(e).__name__} - {e}")
 
-    def get_all(self, db_name, collection_name):
+    def con_logs(self, logs_dir):
+        """
+        Retorna una instancia que comparte el cliente (y su pool de conexiones) de esta,
+        pero registra en otra carpeta de logs (ej. la de cada ciudad en EjecucionMultiCiudad).
+        La conexión se sigue cerrando desde la instancia original.
+        """
+        mongo = DatabaseMongo(self.uri, self.explicar_consultas, self.estadisticas_explain, logs_dir=logs_dir)
+        mongo.client = self.client
+        return mongo
+
+    def get_all(self, db_name, collection_name, filtro_extra=None):
         """
         Obtiene todos los documentos de una colección específica.
         Parámetros:
         -----------
         db_name : str -> Nombre de la base de datos.
         collection_name : str -> Nombre de la colección.
+        filtro_extra : dict, opcional -> Filtro adicional (ej. muestra de listing_id).
         Retorna:
         --------
         list -> Lista con todos los documentos.
@@ -64,9 +110,12 @@ class DatabaseMongo:
         try:
             db = self.client[db_name]
             collection = db[collection_name]
+            query = dict(filtro_extra or {})
+            if self.explicar_consultas:
+                self.explicar(db_name, collection_name, query)
             # Extraer todos los documentos de la colección
-            data = list(collection.find())
-            count = collection.count_documents({})
+            data = list(collection.find(query))
+            count = len(data)
             self.log.info(f"[GET_ALL] - Se extrajeron {count} documentos de {db_name}.{collection_name} correctamente.")
             return data
         except Exception as e:
@@ -74,7 +123,7 @@ class DatabaseMongo:
             self.log.error(f"[GET_ALL] - Error durante la extracción en {db_name}.{collection_name}: {type(e).__name__} - {e}")
             return []
 
-    def get_range(self, db_name, collection_name, fecha_inicio, fecha_fin):
+    def get_range(self, db_name, collection_name, fecha_inicio, fecha_fin, filtro_extra=None):
         """
         Obtiene documentos filtrando por un rango de fechas.
         Los documentos deben tener un campo 'date' en formato datetime.
@@ -84,6 +133,7 @@ class DatabaseMongo:
         collection_name : str -> Nombre de la colección.
         fecha_inicio : str -> Fecha inicial (YYYY-MM-DD).
         fecha_fin : str -> Fecha final (YYYY-MM-DD).
+        filtro_extra : dict, opcional -> Filtro adicional (ej. muestra de listing_id).
         Retorna:
         --------
         list -> Lista de documentos dentro del rango especificado.
@@ -110,6 +160,10 @@ class DatabaseMongo:
                     "$lte": fecha_fin_dt
                 }
             }
+            query.update(filtro_extra or {})
+
+            if self.explicar_consultas:
+                self.explicar(db_name, collection_name, query)
 
             # Ejecutar la consulta y transformar el cursor a lista
             data = list(collection.find(query))
@@ -128,6 +182,281 @@ class DatabaseMongo:
             self.log.error(f"[GET_RANGE] - Error al extraer datos: {type(e).__name__} - {e}")
             return []
 
+    def get_distinct(self, db_name, collection_name, campo):
+        """
+        Obtiene los valores distintos de un campo (resuelto en el servidor).
+        Parámetros:
+        -----------
+        db_name : str -> Nombre de la base de datos.
+        collection_name : str -> Nombre de la colección.
+        campo : str -> Campo a consultar (ej. 'id').
+        Retorna:
+        --------
+        list -> Valores distintos del campo.
+        """
+        if self.client is None:
+            error_msg = "[DISTINCT] - No hay conexión activa. Llama primero a connect()."
+            self.log.error(error_msg)
+            raise Exception(error_msg)
+
+        try:
+            valores = self.client[db_name][collection_name].distinct(campo)
+            self.log.info(f"[DISTINCT] - {len(valores)} valores distintos de '{campo}' en {db_name}.{collection_name}.")
+            return valores
+        except Exception as e:
+            self.log.error(f"[DISTINCT] - Error al obtener valores de '{campo}' en {db_name}.{collection_name}: {type(e).__name__} - {e}")
+            return []
+
+    def iter_batches(self, db_name, collection_name, query=None, batch_size=50000):
+        """
+        Recorre una colección por lotes sin cargarla completa en memoria.
+        Parámetros:
+        -----------
+        db_name : str -> Nombre de la base de datos.
+        collection_name : str -> Nombre de la colección.
+        query : dict, opcional -> Filtro de la consulta (por defecto: toda la colección).
+        batch_size : int -> Documentos por lote.
+        Retorna:
+        --------
+        generator -> Listas de hasta `batch_size` documentos.
+        """
+        if self.client is None:
+            error_msg = "[ITER] - No hay conexión activa. Llama primero a connect()."
+            self.log.error(error_msg)
+            raise Exception(error_msg)
+
+        query = query or {}
+        self.log.info(f"[ITER] - Recorriendo {db_name}.{collection_name} por lotes de {batch_size} (filtro={query})...")
+        if self.explicar_consultas:
+            self.explicar(db_name, collection_name, query)
+
+        cursor = self.client[db_name][collection_name].find(query, batch_size=batch_size)
+        lote = []
+        total = 0
+        try:
+            for documento in cursor:
+                lote.append(documento)
+                if len(lote) >= batch_size:
+                    total += len(lote)
+                    yield lote
+                    lote = []
+            if lote:
+                total += len(lote)
+                yield lote
+        finally:
+            cursor.close()
+            self.log.info(f"[ITER] - Documentos recorridos en {db_name}.{collection_name}: {total}")
+
+    def get_calendar_mensual(self, db_name, collection_name, fecha_inicio, fecha_fin, filtro_extra=None):
+        """
+        Calcula en el servidor las métricas mensuales de calendar por listing
+        mediante un pipeline de agregación (disponibilidad y estadísticas de precio).
+        Parámetros:
+        -----------
+        db_name : str -> Nombre de la base de datos.
+        collection_name : str -> Nombre de la colección de calendar.
+        fecha_inicio : str -> Fecha inicial (YYYY-MM-DD).
+        fecha_fin : str -> Fecha final (YYYY-MM-DD).
+        filtro_extra : dict, opcional -> Filtro adicional aplicado en el $match (ej. muestra de listing_id).
+        Retorna:
+        --------
+        list -> Un documento por listing_id, año y mes.
+        """
+        if self.client is None:
+            error_msg = "[AGGREGATE] - No hay conexión activa. Llama primero a connect()."
+            self.log.error(error_msg)
+            raise Exception(error_msg)
+
+        try:
+            self.log.info(f"[AGGREGATE] - Agregando {db_name}.{collection_name} por listing y mes entre {fecha_inicio} y {fecha_fin}...")
+            collection = self.client[db_name][collection_name]
+
+            match = {
+                "date": {
+                    "$gte": pd.to_datetime(fecha_inicio),
+                    "$lte": pd.to_datetime(fecha_fin)
+                }
+            }
+            match.update(filtro_extra or {})
+            if self.explicar_consultas:
+                self.explicar(db_name, collection_name, match)
+
+            # Precio como número: se eliminan '$' y ',' del texto (Inside Airbnb: "$1,234.00")
+            precio = {
+                "$convert": {
+                    "input": {
+                        "$replaceAll": {
+                            "input": {
+                                "$replaceAll": {
+                                    "input": {"$toString": "$price"},
+                                    "find": {"$literal": "$"},
+                                    "replacement": ""
+                                }
+                            },
+                            "find": ",",
+                            "replacement": ""
+                        }
+                    },
+                    "to": "double",
+                    "onError": None,
+                    "onNull": None
+                }
+            }
+            # 'available' puede venir como 't'/'f' o como booleano
+            disponible = {"$cond": [{"$in": ["$available", ["t", "true", "True", True]]}, 1, 0]}
+
+            pipeline = [
+                {"$match": match},
+                {"$project": {
+                    "_id": 0,
+                    "listing_id": 1,
+                    "year": {"$year": "$date"},
+                    "month": {"$month": "$date"},
+                    "disponible": disponible,
+                    "precio": precio
+                }},
+                {"$group": {
+                    "_id": {"listing_id": "$listing_id", "year": "$year", "month": "$month"},
+                    "noches_totales": {"$sum": 1},
+                    "noches_disponibles": {"$sum": "$disponible"},
+                    "precio_promedio": {"$avg": "$precio"},
+                    "precio_min": {"$min": "$precio"},
+                    "precio_max": {"$max": "$precio"}
+                }},
+                {"$project": {
+                    "_id": 0,
+                    "listing_id": "$_id.listing_id",
+                    "year": "$_id.year",
+                    "month": "$_id.month",
+                    "noches_totales": 1,
+                    "noches_disponibles": 1,
+                    "tasa_disponibilidad": {"$divide": ["$noches_disponibles", "$noches_totales"]},
+                    "tasa_ocupacion": {"$subtract": [1, {"$divide": ["$noches_disponibles", "$noches_totales"]}]},
+                    "precio_promedio": 1,
+                    "precio_min": 1,
+                    "precio_max": 1
+                }},
+                {"$sort": {"listing_id": 1, "year": 1, "month": 1}}
+            ]
+
+            data = list(collection.aggregate(pipeline, allowDiskUse=True))
+            self.log.info(f"[AGGREGATE] - Documentos agregados recuperados: {len(data)}")
+
+            if not data:
+                self.log.error("[AGGREGATE] - No hay datos para el rango indicado.")
+                return []
+
+            return data
+
+        except Exception as e:
+            self.log.error(f"[AGGREGATE] - Error al agregar datos: {type(e).__name__} - {e}")
+            return []
+
+    def asegurar_indices(self, db_name, collection_name=None):
+        """
+        Crea de forma idempotente los índices declarados en INDICES_REQUERIDOS.
+        Si el índice ya existe, MongoDB no realiza ninguna acción.
+        Parámetros:
+        -----------
+        db_name : str -> Nombre de la base de datos.
+        collection_name : str, opcional -> Colección a indexar. Si es None se indexan todas las declaradas.
+        Retorna:
+        --------
+        list -> Nombres de los índices asegurados.
+        """
+        if self.client is None:
+            error_msg = "[INDEX] - No hay conexión activa. Llama primero a connect()."
+            self.log.error(error_msg)
+            raise Exception(error_msg)
+
+        if collection_name is None:
+            colecciones = list(self.INDICES_REQUERIDOS.keys())
+        else:
+            colecciones = [collection_name]
+
+        creados = []
+        db = self.client[db_name]
+        for nombre in colecciones:
+            for claves in self.INDICES_REQUERIDOS.get(nombre, []):
+                try:
+                    # background=True evita bloquear la colección en servidores que aún lo respetan
+                    indice = db[nombre].create_index(claves, background=True)
+                    creados.append(indice)
+                    self.log.info(f"[INDEX] - Índice '{indice}' asegurado en {db_name}.{nombre}.")
+                except Exception as e:
+                    self.log.error(f"[INDEX] - Error al crear índice {claves} en {db_name}.{nombre}: {type(e).__name__} - {e}")
+        return creados
+
+    def _etapas_plan(self, plan):
+        """Recorre recursivamente un plan de ejecución y devuelve los nombres de sus etapas."""
+        etapas = []
+        if isinstance(plan, dict):
+            if "stage" in plan:
+                etapas.append(plan["stage"])
+            for valor in plan.values():
+                etapas.extend(self._etapas_plan(valor))
+        elif isinstance(plan, list):
+            for valor in plan:
+                etapas.extend(self._etapas_plan(valor))
+        return etapas
+
+    def explicar(self, db_name, collection_name, query):
+        """
+        Ejecuta explain() sobre una consulta find y registra el plan ganador.
+        Con un filtro vacío no se consulta (el plan es siempre un recorrido completo).
+        Por defecto solo se consulta al planificador; con `estadisticas_explain` se usa
+        'executionStats', que ejecuta la consulta para contar claves y documentos examinados.
+        Parámetros:
+        -----------
+        db_name : str -> Nombre de la base de datos.
+        collection_name : str -> Nombre de la colección.
+        query : dict -> Filtro de la consulta.
+        Retorna:
+        --------
+        dict -> Resumen con el tipo de plan, índices usados, claves y documentos examinados.
+        """
+        if not query:
+            return {}
+        try:
+            db = self.client[db_name]
+            verbosidad = "executionStats" if self.estadisticas_explain else "queryPlanner"
+            resultado = db.command(
+                {"explain": {"find": collection_name, "filter": query}, "verbosity": verbosidad}
+            )
+            etapas = self._etapas_plan(resultado.get("queryPlanner", {}).get("winningPlan", {}))
+            stats = resultado.get("executionStats", {})
+
+            if "COLLSCAN" in etapas:
+                tipo = "COLLSCAN"
+            elif "IXSCAN" in etapas or "EXPRESS_IXSCAN" in etapas:
+                tipo = "IXSCAN"
+            else:
+                tipo = etapas[0] if etapas else "DESCONOCIDO"
+
+            resumen = {
+                "plan": tipo,
+                "etapas": etapas,
+                "claves_examinadas": stats.get("totalKeysExamined"),
+                "documentos_examinados": stats.get("totalDocsExamined"),
+                "documentos_retornados": stats.get("nReturned"),
+            }
+            mensaje = f"[EXPLAIN] - {db_name}.{collection_name} filtro={query} -> plan {tipo} (etapas: {etapas})."
+            if stats:
+                mensaje += (
+                    f" Claves examinadas: {resumen['claves_examinadas']}, "
+                    f"documentos examinados: {resumen['documentos_examinados']}, "
+                    f"retornados: {resumen['documentos_retornados']}."
+                )
+            # Un COLLSCAN con filtro indica que falta un índice
+            if tipo == "COLLSCAN":
+                self.log.error(mensaje + " La consulta no usa índices; ejecuta asegurar_indices().")
+            else:
+                self.log.info(mensaje)
+            return resumen
+        except Exception as e:
+            self.log.error(f"[EXPLAIN] - Error al explicar la consulta en {db_name}.{collection_name}: {type(e).__name__} - {e}")
+            return {}
+
     def close(self):
         """Cierra la conexión con MongoDB."""
         if self.client:
@@ -145,10 +474,29 @@ class DatabaseMongo:
 # Administra la conexión y carga de datos hacia Azure SQL Database.
 # ===========================================================
 class DatabaseSQL:
-    def __init__(self, server, database, username, password, driver="{ODBC Driver 18 for SQL Server}"):
+    # Diseño físico de las tablas grandes (la clave coincide con el nombre o su sufijo,
+    # de modo que también aplica a tablas con prefijo de ciudad, ej. 'mx_silver_calendar'):
+    # - 'particion': columnas (año, mes); se particiona por una columna calculada persistida
+    #   'periodo' = año * 100 + mes, con un límite por mes entre 'anios'.
+    # - 'indices': columnas con índice no agrupado (alineado con la partición).
+    # Las tablas con diseño se crean con tipos de datos y un índice columnstore agrupado.
+    DISENOS_TABLA = {
+        "silver_calendar": {"particion": ("year", "month"), "indices": ["listing_id"], "anios": (2008, 2035)},
+        "silver_reviews": {"particion": ("review_year", "review_month"), "indices": ["listing_id"], "anios": (2008, 2035)},
+    }
+
+    # Filas por llamada de inserción en tablas columnstore (y por checkpoint en RecargaSilver).
+    # executemany de pyodbc no usa la API de carga masiva: las filas entran al delta store
+    # sin importar el tamaño del lote, y compactar_columnstore las comprime al final de la carga.
+    # El tamaño solo acota la memoria de cada llamada y el número de transacciones.
+    FILAS_LOTE_COLUMNSTORE = 102400 * 4
+
+    def __init__(self, server, database, username, password, driver="{ODBC Driver 18 for SQL Server}", logs_dir=None, disenos=None):
         """
         Constructor de la clase DatabaseSQL.
         Configura los parámetros necesarios para conectar a Azure SQL.
+        logs_dir (opcional) permite separar los logs por ejecución (por defecto: ../logs).
+        disenos (opcional) reemplaza DISENOS_TABLA; con {} todas las tablas se crean con el esquema genérico.
         """
         self.server = server
         self.database = database
@@ -156,10 +504,12 @@ class DatabaseSQL:
         self.password = password
         self.driver = driver
         self.conn = None
+        self.disenos = self.DISENOS_TABLA if disenos is None else disenos
 
         # Crear logs con timestamp único
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+        if logs_dir is None:
+            logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
         os.makedirs(logs_dir, exist_ok=True)
         log_filename = f"logs_{timestamp}.txt"
         log_path = os.path.join(logs_dir, log_filename)
@@ -168,6 +518,8 @@ class DatabaseSQL:
     def connect(self):
         """Establece la conexión con Azure SQL utilizando pyodbc."""
         try:
+            import pyodbc
+
             # Construir cadena de conexión segura a Azure SQL
             conn_str = (
                 f"DRIVER={self.driver};"
@@ -237,36 +589,16 @@ class DatabaseSQL:
 
         cursor = self.conn.cursor()
         try:
-            # Verificar existencia de tabla
-            if not self._table_exists(table_name, schema):
-                self.log.info(f"|SQL AZURE| - La tabla '{schema}.{table_name}' no existe. Se procederá a crearla.")
-                
-                # Usar método optimizado si la tabla es 'reviews'
-                if table_name == "reviews":
-                    self.log.info(f"|SQL AZURE| - Usando esquema optimizado (Reviews) para '{table_name}'.")
-                    self._create_table_from_df_review(df, table_name, schema)
-                else:
-                    self.log.info(f"|SQL AZURE| - Usando esquema genérico para '{table_name}'.")
-                    self._create_table_from_df(df, table_name, schema)
-                    
-            else:
-                # Vaciar tabla existente
-                self.log.info(f"|SQL AZURE| - La tabla '{schema}.{table_name}' ya existe. Eliminando registros...")
-                cursor.execute(f"DELETE FROM {schema}.{table_name}")
-                self.conn.commit()
+            # Crear la tabla o vaciarla si ya existe
+            self._prepare_table(cursor, df, table_name, schema)
 
             # Insertar nuevos datos en la tabla
             self.log.info(f"|SQL AZURE| - Insertando {len(df)} registros en {schema}.{table_name}...")
-            columns = ", ".join([f"[{c}]" for c in df.columns])
-            placeholders = ", ".join(["?"] * len(df.columns))
-            insert_query = f"INSERT INTO {schema}.{table_name} ({columns}) VALUES ({placeholders})"
-
-            # Optimización para carga masiva
-            cursor.fast_executemany = True
-            cursor.executemany(insert_query, df.astype(str).values.tolist()) 
+            self._insert_rows(cursor, df, table_name, schema)
             self.conn.commit()
 
             self.log.info(f"|SQL AZURE| - Tabla '{schema}.{table_name}' sobrescrita correctamente con {len(df)} registros.")
+            self.compactar_columnstore(table_name, schema)
 
         except Exception as e:
             # Registrar y mostrar errores
@@ -276,6 +608,243 @@ class DatabaseSQL:
         finally:
             cursor.close()
 
+    def _prepare_table(self, cursor, df, table_name, schema="dbo"):
+        """Crea la tabla a partir del DataFrame si no existe; si existe, elimina sus registros."""
+        diseno = self._diseno(table_name)
+        existe = self._table_exists(table_name, schema)
+
+        if existe and diseno is not None and not self._es_columnstore(cursor, table_name, schema):
+            # Tabla creada antes con el esquema genérico: se recrea con el diseño declarado
+            self.log.info(f"|SQL AZURE| - '{schema}.{table_name}' no es columnstore. Se elimina para recrearla con su diseño.")
+            cursor.execute(f"DROP TABLE {schema}.{table_name}")
+            self.conn.commit()
+            existe = False
+
+        # Verificar existencia de tabla
+        if not existe:
+            self.log.info(f"|SQL AZURE| - La tabla '{schema}.{table_name}' no existe. Se procederá a crearla.")
+
+            if diseno is not None:
+                self.log.info(f"|SQL AZURE| - Usando diseño columnstore particionado para '{table_name}'.")
+                self._create_table_columnstore(cursor, df, table_name, schema, diseno)
+            # Usar método optimizado si la tabla es 'reviews'
+            elif table_name == "reviews":
+                self.log.info(f"|SQL AZURE| - Usando esquema optimizado (Reviews) para '{table_name}'.")
+                self._create_table_from_df_review(df, table_name, schema)
+            else:
+                self.log.info(f"|SQL AZURE| - Usando esquema genérico para '{table_name}'.")
+                self._create_table_from_df(df, table_name, schema)
+
+        elif diseno is not None:
+            # TRUNCATE libera las particiones y rowgroups sin registrar cada fila eliminada
+            self.log.info(f"|SQL AZURE| - La tabla '{schema}.{table_name}' ya existe. Vaciando con TRUNCATE...")
+            cursor.execute(f"TRUNCATE TABLE {schema}.{table_name}")
+            self.conn.commit()
+
+        else:
+            # Vaciar tabla existente
+            self.log.info(f"|SQL AZURE| - La tabla '{schema}.{table_name}' ya existe. Eliminando registros...")
+            cursor.execute(f"DELETE FROM {schema}.{table_name}")
+            self.conn.commit()
+
+    def _diseno(self, table_name):
+        """Retorna el diseño físico declarado para la tabla (o None si usa el esquema genérico)."""
+        for nombre, diseno in self.disenos.items():
+            if table_name == nombre or table_name.endswith(nombre):
+                return diseno
+        return None
+
+    def _es_columnstore(self, cursor, table_name, schema="dbo"):
+        """Verifica si la tabla tiene un índice columnstore agrupado (sys.indexes.type = 5)."""
+        cursor.execute(
+            "SELECT COUNT(*) FROM sys.indexes WHERE object_id = OBJECT_ID(?) AND type = 5",
+            f"{schema}.{table_name}"
+        )
+        return cursor.fetchone()[0] > 0
+
+    def _tipo_sql(self, col, dtype, diseno):
+        """Tipo SQL de una columna según su tipo en pandas."""
+        if col in diseno["particion"]:
+            return "INT"
+        if pd.api.types.is_bool_dtype(dtype):
+            return "BIT"
+        if pd.api.types.is_integer_dtype(dtype):
+            return "BIGINT"
+        if pd.api.types.is_float_dtype(dtype):
+            return "FLOAT"
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return "DATETIME2(0)"
+        # Texto acotado: las columnas indexadas no pueden superar 900 bytes de clave
+        return "NVARCHAR(450)" if col in diseno["indices"] else "NVARCHAR(4000)"
+
+    def _create_table_columnstore(self, cursor, df, table_name, schema, diseno):
+        """
+        Crea una tabla tipada con:
+        - columna calculada persistida 'periodo' = año * 100 + mes;
+        - función y esquema de partición mensual sobre 'periodo' (se reutilizan si ya existen);
+        - índice columnstore agrupado e índices no agrupados alineados con la partición.
+        """
+        col_anio, col_mes = diseno["particion"]
+        funcion = f"pf_{schema}_{table_name}"
+        esquema_part = f"ps_{schema}_{table_name}"
+
+        cursor.execute("SELECT COUNT(*) FROM sys.partition_functions WHERE name = ?", funcion)
+        if cursor.fetchone()[0] == 0:
+            anio_ini, anio_fin = diseno["anios"]
+            limites = ", ".join(str(a * 100 + m) for a in range(anio_ini, anio_fin + 1) for m in range(1, 13))
+            cursor.execute(f"CREATE PARTITION FUNCTION {funcion} (INT) AS RANGE RIGHT FOR VALUES ({limites})")
+            cursor.execute(f"CREATE PARTITION SCHEME {esquema_part} AS PARTITION {funcion} ALL TO ([PRIMARY])")
+            self.log.info(f"|SQL AZURE| - Partición mensual {funcion} ({anio_ini}-{anio_fin}) creada.")
+
+        cols = [f"[{col}] {self._tipo_sql(col, dtype, diseno)}" for col, dtype in df.dtypes.items()]
+        cols.append(f"[periodo] AS (CAST([{col_anio}] * 100 + [{col_mes}] AS INT)) PERSISTED")
+        cursor.execute(f"CREATE TABLE {schema}.{table_name} ({', '.join(cols)}) ON {esquema_part}([periodo])")
+        cursor.execute(
+            f"CREATE CLUSTERED COLUMNSTORE INDEX [cci_{table_name}] ON {schema}.{table_name} ON {esquema_part}([periodo])"
+        )
+        for col in diseno["indices"]:
+            cursor.execute(
+                f"CREATE NONCLUSTERED INDEX [ix_{table_name}_{col}] ON {schema}.{table_name} ([{col}]) ON {esquema_part}([periodo])"
+            )
+        self.conn.commit()
+
+        self.log.info(
+            f"|SQL AZURE| - Tabla '{schema}.{table_name}' creada con columnstore agrupado, partición por "
+            f"({col_anio}, {col_mes}) e índices en {diseno['indices']}."
+        )
+
+    def compactar_columnstore(self, table_name, schema="dbo"):
+        """
+        Comprime los rowgroups abiertos (delta store) de una tabla columnstore tras una carga.
+        No hace nada si la tabla no tiene diseño columnstore.
+        """
+        if self._diseno(table_name) is None or self.conn is None:
+            return
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(
+                f"ALTER INDEX [cci_{table_name}] ON {schema}.{table_name} REORGANIZE WITH (COMPRESS_ALL_ROW_GROUPS = ON)"
+            )
+            self.conn.commit()
+            self.log.info(f"|SQL AZURE| - Rowgroups de '{schema}.{table_name}' comprimidos (REORGANIZE).")
+        except Exception as e:
+            self.log.error(f"|SQL AZURE| - Error al compactar el columnstore de '{schema}.{table_name}': {repr(e)}")
+        finally:
+            cursor.close()
+
+    def prepare_table(self, df, table_name, schema="dbo"):
+        """
+        Deja la tabla lista para una carga por bloques: la crea con la estructura
+        del DataFrame (puede ser solo el primer bloque) o elimina sus registros.
+        Retorna True si la tabla quedó preparada.
+        """
+        if self.conn is None:
+            self.log.error("|SQL AZURE| - No hay conexión activa. Usa connect() primero.")
+            return False
+
+        cursor = self.conn.cursor()
+        try:
+            self._prepare_table(cursor, df, table_name, schema)
+            return True
+        except Exception as e:
+            self.log.error(f"|SQL AZURE| - Error al preparar la tabla '{schema}.{table_name}': {repr(e)}")
+            return False
+        finally:
+            cursor.close()
+
+    def insert_chunk(self, df, table_name, schema="dbo"):
+        """
+        Inserta un bloque de filas en una tabla ya preparada y confirma la transacción.
+        Retorna el número de filas insertadas (0 si hubo error).
+        """
+        if self.conn is None:
+            self.log.error("|SQL AZURE| - No hay conexión activa. Usa connect() primero.")
+            return 0
+
+        cursor = self.conn.cursor()
+        try:
+            self._insert_rows(cursor, df, table_name, schema)
+            self.conn.commit()
+            self.log.info(f"|SQL AZURE| - Bloque de {len(df)} registros insertado en {schema}.{table_name}.")
+            return len(df)
+        except Exception as e:
+            self.conn.rollback()
+            self.log.error(f"|SQL AZURE| - Error al insertar bloque en '{schema}.{table_name}': {repr(e)}")
+            return 0
+        finally:
+            cursor.close()
+
+    def _insert_rows(self, cursor, df, table_name, schema="dbo"):
+        """Inserta las filas del DataFrame con fast_executemany (sin hacer commit)."""
+        columns = ", ".join([f"[{c}]" for c in df.columns])
+        placeholders = ", ".join(["?"] * len(df.columns))
+        insert_query = f"INSERT INTO {schema}.{table_name} ({columns}) VALUES ({placeholders})"
+
+        # Optimización para carga masiva
+        cursor.fast_executemany = True
+        if self._diseno(table_name) is None:
+            cursor.executemany(insert_query, df.astype(str).values.tolist())
+            return
+
+        # Tablas tipadas: valores nativos (None para nulos) en lotes de FILAS_LOTE_COLUMNSTORE filas
+        for inicio in range(0, len(df), self.FILAS_LOTE_COLUMNSTORE):
+            lote = df.iloc[inicio:inicio + self.FILAS_LOTE_COLUMNSTORE]
+            cursor.executemany(insert_query, lote.astype(object).where(lote.notna(), None).values.tolist())
+
+    def replace_partitions(self, df, table_name, partition_cols, schema="dbo"):
+        """
+        Reemplaza únicamente las particiones presentes en el DataFrame:
+        - Si la tabla no existe, la crea con el esquema genérico.
+        - Si existe, elimina las filas cuyas claves de partición aparecen en el DataFrame.
+        - Luego inserta las filas del DataFrame.
+        El resto de la tabla no se modifica.
+
+        Parámetros:
+        df (pd.DataFrame): Filas recalculadas de las particiones afectadas.
+        table_name (str): Nombre de la tabla destino.
+        partition_cols (list): Columnas que identifican una partición (ej. ['listing_id', 'year', 'month']).
+        schema (str): Esquema de base de datos.
+        """
+        if self.conn is None:
+            self.log.error("|SQL AZURE| - No hay conexión activa. Usa connect() primero.")
+            return
+
+        cursor = self.conn.cursor()
+        try:
+            if not self._table_exists(table_name, schema):
+                self.log.info(f"|SQL AZURE| - La tabla '{schema}.{table_name}' no existe. Se procederá a crearla.")
+                self._create_table_from_df(df, table_name, schema)
+            else:
+                # Claves de las particiones afectadas, en el mismo formato de texto usado al insertar
+                claves = df[partition_cols].drop_duplicates().astype(str).values.tolist()
+                self.log.info(f"|SQL AZURE| - Eliminando {len(claves)} particiones afectadas en {schema}.{table_name}...")
+
+                cols_tmp = ", ".join([f"[{c}] NVARCHAR(450)" for c in partition_cols])
+                cursor.execute(f"CREATE TABLE #particiones ({cols_tmp})")
+                cursor.fast_executemany = True
+                cursor.executemany(
+                    f"INSERT INTO #particiones VALUES ({', '.join(['?'] * len(partition_cols))})",
+                    claves
+                )
+                condicion = " AND ".join([f"t.[{c}] = p.[{c}]" for c in partition_cols])
+                cursor.execute(f"DELETE t FROM {schema}.{table_name} t INNER JOIN #particiones p ON {condicion}")
+                self.log.info(f"|SQL AZURE| - Registros eliminados en {schema}.{table_name}: {cursor.rowcount}.")
+                cursor.execute("DROP TABLE #particiones")
+
+            self.log.info(f"|SQL AZURE| - Insertando {len(df)} registros en {schema}.{table_name}...")
+            self._insert_rows(cursor, df, table_name, schema)
+            self.conn.commit()
+
+            self.log.info(f"|SQL AZURE| - Particiones de '{schema}.{table_name}' reemplazadas correctamente con {len(df)} registros.")
+
+        except Exception as e:
+            self.conn.rollback()
+            self.log.error(f"|SQL AZURE| - Error al reemplazar particiones de '{schema}.{table_name}': {repr(e)}")
+            print(f"Error al reemplazar particiones de '{schema}.{table_name}'. Ver logs para más detalles.")
+
+        finally:
+            cursor.close()
+
     def _create_table_from_df_review(self, df, table_name, schema="dbo"):
         """
         Crea una tabla 'reviews' con tipos de datos optimizados
@@ -1,9 +1,26 @@
 import os
+import hashlib
 import pandas as pd
 from datetime import datetime
 from logs_bi import Logs
 
 
+def _en_muestra(clave, fraccion, semilla=0):
+    """
+    Decide de forma determinista si una clave pertenece a la muestra:
+    el hash de la clave con la semilla, llevado a [0, 1), se compara con la fracción.
+    """
+    digest = hashlib.md5(f"{semilla}:{clave}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64 < fraccion
+
+
+def _clave_id(valor):
+    """Forma de texto canónica de un id (123, 123.0 y '123' dan la misma clave)."""
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor)
+
+
 class Extracciones:
     """
     Clase responsable de la extracción de datos desde una base de datos MongoDB
@@ -11,9 +28,15 @@ class Extracciones:
 
     Permite realizar extracciones completas de colecciones o dentro de rangos de fechas.
     Incluye registro de eventos (logs) para seguimiento de procesos.
+
+    Con configurar_muestra() todas las extracciones se limitan a un subconjunto
+    determinista de listings, el mismo en listings, calendar y reviews.
     """
 
-    def __init__(self, mongo_instance):
+    # Campo que identifica al listing en cada colección (por defecto: 'listing_id')
+    CAMPOS_LISTING = {"listings": "id"}
+
+    def __init__(self, mongo_instance, data_dir=None, logs_dir=None):
         """
         Constructor de la clase Extracciones.
 
@@ -21,6 +44,10 @@ class Extracciones:
         -----------
         mongo_instance : DatabaseMongo
             Instancia de conexión a MongoDB ya establecida.
+        data_dir : str, opcional
+            Carpeta base de datos; los CSV se guardan en `data_dir/raw` (por defecto: ../data).
+        logs_dir : str, opcional
+            Carpeta de logs (por defecto: ../logs).
 
         Acciones:
         ---------
@@ -28,16 +55,69 @@ class Extracciones:
         - Guarda la referencia a la conexión de MongoDB.
         """
         self.mongo = mongo_instance
+        if data_dir is None:
+            data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+        self.data_dir = data_dir
+        self.muestra = None
 
         # Crear archivo de log con timestamp único
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+        if logs_dir is None:
+            logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
         os.makedirs(logs_dir, exist_ok=True)
         log_filename = f"logs_{timestamp}.txt"
         self.log = Logs(os.path.join(logs_dir, log_filename))
 
         self.log.info("[INIT] - Clase Extracciones inicializada correctamente.")
 
+    # ----------------------------------------------------------
+    # Muestreo consistente por listing
+    # ----------------------------------------------------------
+    def configurar_muestra(self, db_name, fraccion, semilla=0, collection_name="listings"):
+        """
+        Selecciona una fracción determinista de listings por hash de su id. Desde este momento
+        todas las extracciones filtran en MongoDB por esos listings ($in sobre id / listing_id).
+
+        Parámetros:
+        -----------
+        db_name : str
+            Nombre de la base de datos de MongoDB.
+        fraccion : float
+            Fracción de listings a conservar (ej. 0.01). Con None o >= 1 se desactiva la muestra.
+        semilla : int, opcional
+            Cambia el subconjunto manteniendo el mismo tamaño esperado.
+        collection_name : str, opcional
+            Colección de la que se leen los ids.
+
+        Retorna:
+        --------
+        int -> Listings seleccionados (0 si la muestra está desactivada).
+        """
+        if fraccion is None or fraccion >= 1:
+            self.muestra = None
+            self.log.info("[SAMPLE] - Muestra desactivada: se extraen las colecciones completas.")
+            return 0
+
+        campo = self.CAMPOS_LISTING.get(collection_name, "listing_id")
+        ids = self.mongo.get_distinct(db_name, collection_name, campo)
+        claves = sorted({_clave_id(v) for v in ids if v is not None and _en_muestra(_clave_id(v), fraccion, semilla)})
+
+        # Los ids pueden estar guardados como número o como texto según la colección
+        valores = list(claves)
+        valores += [int(c) for c in claves if c.lstrip("-").isdigit()]
+        self.muestra = valores
+        self.log.info(
+            f"[SAMPLE] - Muestra de {len(claves)} de {len(ids)} listings "
+            f"(fracción {fraccion}, semilla {semilla}) aplicada a todas las extracciones."
+        )
+        return len(claves)
+
+    def _filtro_muestra(self, collection_name):
+        """Filtro MongoDB de la muestra para una colección (None si no hay muestra)."""
+        if self.muestra is None:
+            return None
+        return {self.CAMPOS_LISTING.get(collection_name, "listing_id"): {"$in": self.muestra}}
+
     # ----------------------------------------------------------
     # MÉTODO 1: Extracción completa de una colección MongoDB
     # ----------------------------------------------------------
@@ -62,7 +142,7 @@ class Extracciones:
 
         try:
             # Recuperar todos los documentos de la colección
-            data = self.mongo.get_all(db_name, collection_name)
+            data = self.mongo.get_all(db_name, collection_name, self._filtro_muestra(collection_name))
             self.log.info(f"[EXTRACT] - Datos obtenidos desde MongoDB: {len(data)} registros recuperados.")
 
             # Si no hay datos, se interrumpe el proceso
@@ -80,7 +160,7 @@ class Extracciones:
                     df[col] = df[col].astype(str)
 
             # Crear carpeta de salida si no existe
-            csv_dir = os.path.join(os.path.dirname(__file__), "..", "data", "raw")
+            csv_dir = os.path.join(self.data_dir, "raw")
             os.makedirs(csv_dir, exist_ok=True)
 
             # Definir nombre y ruta del archivo CSV
@@ -104,11 +184,19 @@ class Extracciones:
     # ----------------------------------------------------------
     # MÉTODO 2: Extracción por rango de fechas desde MongoDB
     # ----------------------------------------------------------
-    def extraer_calendar_rango_mongo(self, db_name, collection_name, fecha_inicio, fecha_fin):
+    def extraer_calendar_rango_mongo(self, db_name, collection_name, fecha_inicio, fecha_fin, agregado=False):
         """
         Extrae documentos de MongoDB dentro de un rango de fechas específico,
         los convierte en un DataFrame y los exporta a un archivo CSV.
 
+        Con `agregado=True` la agregación por listing y mes se ejecuta en MongoDB
+        (disponibilidad y estadísticas de precio) y solo se transfiere el resultado,
+        que se exporta como `{collection_name}_mensual.csv`. Es un punto de entrada para
+        uso como librería (análisis ad hoc sin traer las filas diarias): main no lo usa,
+        porque silver_calendar necesita las filas diarias y gold y la sábana recalculan la
+        ocupación a partir de ellas (Gold.construir_ocupacion_mensual, que además estima el
+        ingreso de las noches ocupadas).
+
         Parámetros:
         -----------
         db_name : str
@@ -119,6 +207,9 @@ class Extracciones:
             Fecha inicial en formato 'YYYY-MM-DD'.
         fecha_fin : str
             Fecha final en formato 'YYYY-MM-DD'.
+        agregado : bool, opcional
+            Si es True, extrae métricas mensuales por listing en lugar de filas diarias
+            (solo uso como librería; ningún paso del pipeline lee calendar_mensual.csv).
 
         Retorna:
         --------
@@ -128,8 +219,18 @@ class Extracciones:
         self.log.info(f"[EXTRACT] - Iniciando extracción de {db_name}.{collection_name} entre {fecha_inicio} y {fecha_fin}...")
 
         try:
-            # Obtener documentos que se encuentren dentro del rango de fechas
-            data = self.mongo.get_range(db_name, collection_name, fecha_inicio, fecha_fin)
+            if agregado:
+                # Obtener métricas mensuales ya agregadas en el servidor
+                data = self.mongo.get_calendar_mensual(
+                    db_name, collection_name, fecha_inicio, fecha_fin, self._filtro_muestra(collection_name)
+                )
+                nombre_csv = f"{collection_name}_mensual"
+            else:
+                # Obtener documentos que se encuentren dentro del rango de fechas
+                data = self.mongo.get_range(
+                    db_name, collection_name, fecha_inicio, fecha_fin, self._filtro_muestra(collection_name)
+                )
+                nombre_csv = collection_name
             if not data:
                 self.log.info(f"[EXTRACT] - No se encontraron datos en '{db_name}.{collection_name}' para el rango indicado.")
                 return None
@@ -145,11 +246,11 @@ class Extracciones:
                     df[col] = df[col].astype(str)
 
             # Crear la carpeta de salida si no existe
-            csv_dir = os.path.join(os.path.dirname(__file__), "..", "data", "raw")
+            csv_dir = os.path.join(self.data_dir, "raw")
             os.makedirs(csv_dir, exist_ok=True)
 
             # Definir la ruta del archivo CSV a generar
-            csv_path = os.path.join(csv_dir, f"{collection_name}.csv")
+            csv_path = os.path.join(csv_dir, f"{nombre_csv}.csv")
 
             # Exportar el DataFrame como archivo CSV
             df.to_csv(csv_path, index=False)
@@ -165,4 +266,38 @@ class Extracciones:
             self.log.error(f"[EXTRACT] - Error al procesar '{db_name}.{collection_name}': {type(e).__name__} - {e}")
             return None
 
-           
+    # ----------------------------------------------------------
+    # MÉTODO 3: Extracción por lotes (modo streaming)
+    # ----------------------------------------------------------
+    def extraer_lotes(self, db_name, collection_name, query=None, tam_lote=50000):
+        """
+        Extrae una colección MongoDB por lotes y produce un DataFrame por lote.
+        No genera CSV: los lotes se consumen directamente en el pipeline streaming.
+
+        Parámetros:
+        -----------
+        db_name : str
+            Nombre de la base de datos de MongoDB.
+        collection_name : str
+            Nombre de la colección a extraer.
+        query : dict, opcional
+            Filtro MongoDB (ej. rango de fechas).
+        tam_lote : int, opcional
+            Documentos por lote.
+
+        Retorna:
+        --------
+        generator -> pd.DataFrame por lote, con las columnas no numéricas como texto.
+        """
+        self.log.info(f"[EXTRACT] - Iniciando extracción por lotes de {db_name}.{collection_name}...")
+        query = {**(query or {}), **(self._filtro_muestra(collection_name) or {})}
+        for n_lote, data in enumerate(self.mongo.iter_batches(db_name, collection_name, query, tam_lote)):
+            df = pd.DataFrame(data)
+
+            # Mismo tratamiento que la extracción completa: columnas no numéricas como texto
+            for col in df.columns:
+                if not pd.api.types.is_numeric_dtype(df[col]):
+                    df[col] = df[col].astype(str)
+
+            self.log.info(f"[EXTRACT] - Lote {n_lote} de {collection_name}: {df.shape[0]} filas, {df.shape[1]} columnas.")
+            yield df
@@ -0,0 +1,191 @@
+import os
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from logs_bi import Logs
+
+
+class Gold:
+    """
+    Construye la capa gold: tablas agregadas por listing y mes a partir de las
+    salidas silver de calendar y reviews.
+
+    La carga es incremental: solo se recalculan y reemplazan los meses presentes en
+    la ejecución actual; el resto de la tabla gold se conserva. Como cada agregado se
+    calcula con la ventana de fechas de la ejecución, solo se reemplazan los meses que
+    la ventana cubre por completo (un mes parcial sobrescribiría el mes completo con
+    datos de unos pocos días). Un mes completo se reemplaza entero (year, month), de
+    modo que los listings que ya no tienen filas en ese mes no conservan filas antiguas.
+    """
+
+    # Columnas que identifican una partición en todas las tablas gold
+    CLAVES_PARTICION = ["listing_id", "year", "month"]
+    # Columnas del mes: con ventana de fechas se reemplaza el mes completo
+    CLAVES_MES = ["year", "month"]
+
+    # Categoría de sentimiento -> columna de conteo en gold_sentimiento_mensual
+    COLUMNAS_SENTIMIENTO = {
+        "Positivo": "reviews_positivas",
+        "Negativo": "reviews_negativas",
+        "Neutral": "reviews_neutrales",
+    }
+
+    def __init__(self, logs_dir=None):
+        """
+        Constructor de la clase Gold.
+        Inicializa el logger con un archivo único por ejecución.
+
+        Parámetros:
+        -----------
+        logs_dir : str, opcional
+            Carpeta de logs (por defecto: ../logs).
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if logs_dir is None:
+            logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+        os.makedirs(logs_dir, exist_ok=True)
+        log_filename = f"logs_{timestamp}.txt"
+        self.log = Logs(os.path.join(logs_dir, log_filename))
+
+        self.log.info("[INIT] - Clase Gold inicializada correctamente.")
+
+    def construir_ocupacion_mensual(self, df_calendar):
+        """
+        Agrega calendar silver por listing y mes: noches, ocupación e ingreso estimado.
+        El ingreso estimado suma el precio de las noches no disponibles (reservadas).
+
+        Parámetros:
+        -----------
+        df_calendar : pd.DataFrame
+            Salida de Transformaciones.transformaciones_calendar.
+
+        Retorna:
+        --------
+        pd.DataFrame -> Una fila por listing_id, year y month.
+        """
+        self.log.info("[GOLD] - Construyendo agregado de ocupación mensual...")
+        df = df_calendar[["listing_id", "year", "month", "available", "price"]].copy()
+        df = df.dropna(subset=["listing_id", "year", "month"])
+
+        # 'available' llega como 't'/'f' (o booleano) desde MongoDB
+        df["disponible"] = df["available"].astype(str).str.lower().isin(["t", "true"]).astype(int)
+        df["ocupada"] = 1 - df["disponible"]
+        df["precio"] = pd.to_numeric(
+            df["price"].astype(str).str.replace("$", "", regex=False).str.replace(",", "", regex=False),
+            errors="coerce"
+        )
+        df["ingreso"] = df["precio"].where(df["ocupada"] == 1, 0.0)
+
+        gold = (
+            df.groupby(self.CLAVES_PARTICION, as_index=False)
+            .agg(
+                noches_totales=("disponible", "size"),
+                noches_disponibles=("disponible", "sum"),
+                noches_ocupadas=("ocupada", "sum"),
+                precio_promedio=("precio", "mean"),
+                ingreso_estimado=("ingreso", "sum"),
+            )
+        )
+        gold["tasa_ocupacion"] = gold["noches_ocupadas"] / gold["noches_totales"]
+        gold[["year", "month"]] = gold[["year", "month"]].astype(int)
+
+        self.log.info(f"[GOLD] - Ocupación mensual construida: {len(gold)} filas (listing x mes).")
+        return gold
+
+    def construir_sentimiento_mensual(self, df_reviews):
+        """
+        Agrega reviews silver por listing y mes: mezcla de sentimiento
+        y promedio de 'Puntuacion_Compuesta'.
+
+        Parámetros:
+        -----------
+        df_reviews : pd.DataFrame
+            Salida de Transformaciones.transformaciones_reviews.
+
+        Retorna:
+        --------
+        pd.DataFrame -> Una fila por listing_id, year y month.
+        """
+        self.log.info("[GOLD] - Construyendo agregado de sentimiento mensual...")
+        df = df_reviews.rename(columns={"review_year": "year", "review_month": "month"})
+        df = df.dropna(subset=["listing_id", "year", "month"])
+
+        gold = df.groupby(self.CLAVES_PARTICION).agg(total_reviews=("Sentimiento", "size"))
+        # Conteo por categoría de sentimiento en un solo groupby (sin funciones por grupo)
+        conteos = (
+            df.groupby(self.CLAVES_PARTICION + ["Sentimiento"]).size()
+            .unstack(fill_value=0)
+            .reindex(index=gold.index, columns=list(self.COLUMNAS_SENTIMIENTO), fill_value=0)
+            .rename(columns=self.COLUMNAS_SENTIMIENTO)
+        )
+        gold = gold.join(conteos.astype(int))
+        gold["puntuacion_promedio"] = df.groupby(self.CLAVES_PARTICION)["Puntuacion_Compuesta"].mean()
+        gold = gold.reset_index()
+        gold["proporcion_positivas"] = np.where(
+            gold["total_reviews"] > 0, gold["reviews_positivas"] / gold["total_reviews"], np.nan
+        )
+        gold[["year", "month"]] = gold[["year", "month"]].astype(int)
+
+        self.log.info(f"[GOLD] - Sentimiento mensual construido: {len(gold)} filas (listing x mes).")
+        return gold
+
+    def meses_completos(self, df, fecha_inicio, fecha_fin):
+        """
+        Filtra las filas de los meses cubiertos por completo por la ventana [fecha_inicio, fecha_fin].
+
+        Parámetros:
+        df (pd.DataFrame): Agregado gold con columnas 'year' y 'month'.
+        fecha_inicio (str): Primera fecha extraída (YYYY-MM-DD).
+        fecha_fin (str): Última fecha extraída (YYYY-MM-DD).
+
+        Retorna:
+        pd.DataFrame -> Filas de los meses completos.
+        """
+        primer_dia = pd.to_datetime(pd.DataFrame({"year": df["year"], "month": df["month"], "day": 1}))
+        ultimo_dia = primer_dia + pd.offsets.MonthEnd(0)
+        completos = (primer_dia >= pd.Timestamp(fecha_inicio)) & (ultimo_dia <= pd.Timestamp(fecha_fin))
+
+        parciales = df.loc[~completos, ["year", "month"]].drop_duplicates()
+        if len(parciales):
+            self.log.info(
+                f"[GOLD] - Meses no cubiertos por completo por la ventana {fecha_inicio} - {fecha_fin}, "
+                f"se conservan sin reemplazar: {parciales.astype(str).agg('-'.join, axis=1).tolist()[:12]}."
+            )
+        return df[completos]
+
+    def cargar_incremental(self, df, name, schema, instance, fecha_inicio=None, fecha_fin=None):
+        """
+        Carga un agregado gold reemplazando solo las particiones afectadas.
+
+        Parámetros:
+        df (pd.DataFrame): Agregado gold de la ejecución actual.
+        name (str): Nombre de la tabla destino.
+        schema (str): Esquema de base de datos.
+        instance (DatabaseSQL): Instancia de conexión a base de datos (clase DatabaseSQL).
+        fecha_inicio, fecha_fin (str, opcional): Ventana de fechas con la que se calculó el agregado.
+            Si se indica, solo se reemplazan los meses que la ventana cubre por completo, y se
+            reemplazan enteros (todas las filas del mes). Sin ventana solo se reemplazan las
+            particiones listing x mes presentes en df.
+        """
+        claves = self.CLAVES_PARTICION
+        if fecha_inicio is not None and fecha_fin is not None:
+            claves = self.CLAVES_MES
+            df = self.meses_completos(df, fecha_inicio, fecha_fin)
+            if df.empty:
+                self.log.info(f"[GOLD] - {name}: la ventana no cubre ningún mes completo. No se modifica la tabla.")
+                return
+
+        meses = df[["year", "month"]].drop_duplicates()
+        self.log.info(
+            f"[GOLD] - Carga incremental de {name}: {len(df)} particiones listing x mes "
+            f"en {len(meses)} meses ({meses.astype(str).agg('-'.join, axis=1).tolist()[:12]})."
+        )
+
+        # Abrir conexión a la base de datos
+        instance.connect()
+
+        # Reemplazar solo las particiones recalculadas
+        instance.replace_partitions(df, table_name=name, partition_cols=claves, schema=schema)
+
+        # Cerrar la conexión a la base de datos
+        instance.close()
@@ -0,0 +1,164 @@
+import os
+import hashlib
+import multiprocessing
+import pandas as pd
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from logs_bi import Logs
+
+
+# Código asignado a comentarios vacíos, muy cortos o sin idioma reconocible
+IDIOMA_INDEFINIDO = "und"
+
+
+def _detectar_lote(textos):
+    """
+    Detecta el idioma de una lista de textos.
+    Se define a nivel de módulo para poder ejecutarse en procesos de trabajo.
+    """
+    # langdetect se importa en el proceso que lo usa
+    from langdetect import DetectorFactory, detect
+    from langdetect.lang_detect_exception import LangDetectException
+
+    # Semilla fija: langdetect es no determinista sin ella
+    DetectorFactory.seed = 0
+
+    idiomas = []
+    for texto in textos:
+        try:
+            idiomas.append(detect(texto))
+        except LangDetectException:
+            idiomas.append(IDIOMA_INDEFINIDO)
+    return idiomas
+
+
+class DetectorIdioma:
+    """
+    Detección de idioma por lotes para los comentarios de reviews.
+
+    - Omite la detección en comentarios vacíos o más cortos que `min_caracteres`.
+    - Reutiliza resultados mediante una caché persistente indexada por el hash del comentario.
+    - Detecta solo los comentarios únicos no cacheados, repartidos en lotes entre procesos.
+    """
+
+    def __init__(self, tam_lote=5000, procesos=None, min_caracteres=20, cache_path=None, logs_dir=None):
+        """
+        Constructor de la clase DetectorIdioma.
+
+        Parámetros:
+        -----------
+        tam_lote : int, opcional
+            Número de comentarios por lote enviado a cada proceso.
+        procesos : int, opcional
+            Número de procesos de trabajo (por defecto: núcleos disponibles). Con 1 se ejecuta en serie.
+        min_caracteres : int, opcional
+            Longitud mínima para intentar detectar el idioma.
+        cache_path : str, opcional
+            Archivo Parquet de la caché (por defecto: ../data/idiomas/idiomas.parquet). Va fuera de
+            `data/cache` porque CacheEtapas borra los Parquet de esa carpeta al liberar espacio.
+        logs_dir : str, opcional
+            Carpeta de logs (por defecto: ../logs).
+        """
+        self.tam_lote = tam_lote
+        self.procesos = procesos
+        self.min_caracteres = min_caracteres
+        if cache_path is None:
+            cache_path = os.path.join(os.path.dirname(__file__), "..", "data", "idiomas", "idiomas.parquet")
+        self.cache_path = cache_path
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if logs_dir is None:
+            logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+        os.makedirs(logs_dir, exist_ok=True)
+        log_filename = f"logs_{timestamp}.txt"
+        self.log = Logs(os.path.join(logs_dir, log_filename))
+
+        self.cache = self._cargar_cache()
+        self.log.info(f"[INIT] - Clase DetectorIdioma inicializada ({len(self.cache)} idiomas en caché).")
+
+    def __repr__(self):
+        # Representación estable: forma parte de la clave de CacheEtapas
+        return f"DetectorIdioma(min_caracteres={self.min_caracteres})"
+
+    def _cargar_cache(self):
+        """Lee la caché persistente de idiomas (hash -> idioma)."""
+        if not os.path.exists(self.cache_path):
+            return {}
+        try:
+            df = pd.read_parquet(self.cache_path)
+            return dict(zip(df["hash"], df["language"]))
+        except Exception as e:
+            self.log.error(f"[LANG] - Error al leer la caché de idiomas: {type(e).__name__} - {e}")
+            return {}
+
+    def _guardar_cache(self):
+        """
+        Persiste la caché de idiomas en Parquet con un reemplazo atómico: varios procesos
+        (ej. los de PipelineStreaming) pueden guardarla a la vez sin dejar un archivo a medias.
+        """
+        ruta_tmp = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            df = pd.DataFrame({"hash": list(self.cache.keys()), "language": list(self.cache.values())})
+            df.to_parquet(ruta_tmp, index=False)
+            os.replace(ruta_tmp, self.cache_path)
+        except Exception as e:
+            self.log.error(f"[LANG] - Error al guardar la caché de idiomas: {type(e).__name__} - {e}")
+            if os.path.exists(ruta_tmp):
+                os.remove(ruta_tmp)
+
+    def detectar(self, comentarios):
+        """
+        Detecta el idioma de cada comentario.
+
+        Parámetros:
+        -----------
+        comentarios : pd.Series
+            Textos de los comentarios.
+
+        Retorna:
+        --------
+        pd.Series -> Código ISO 639-1 por comentario ('und' si no se evaluó), con el mismo índice.
+        """
+        textos = comentarios.fillna("").astype(str).str.strip()
+        idiomas = pd.Series(IDIOMA_INDEFINIDO, index=comentarios.index, dtype=object)
+
+        evaluables = textos.str.len() >= self.min_caracteres
+        self.log.info(
+            f"[LANG] - {len(textos)} comentarios recibidos; {int((~evaluables).sum())} vacíos o cortos se marcan como '{IDIOMA_INDEFINIDO}'."
+        )
+        if not evaluables.any():
+            return idiomas
+
+        hashes = textos[evaluables].map(lambda t: hashlib.sha1(t.encode("utf-8")).hexdigest())
+
+        # Solo se detectan los comentarios únicos que no están en caché
+        pendientes = {}
+        for h, texto in zip(hashes.values, textos[evaluables].values):
+            if h not in self.cache and h not in pendientes:
+                pendientes[h] = texto
+        self.log.info(
+            f"[LANG] - Comentarios únicos evaluables: {hashes.nunique()}; "
+            f"aciertos de caché: {hashes.nunique() - len(pendientes)}; por detectar: {len(pendientes)}."
+        )
+
+        if pendientes:
+            claves = list(pendientes.keys())
+            textos_pendientes = list(pendientes.values())
+            lotes = [textos_pendientes[i:i + self.tam_lote] for i in range(0, len(textos_pendientes), self.tam_lote)]
+
+            if self.procesos == 1 or len(lotes) == 1:
+                resultados = [_detectar_lote(lote) for lote in lotes]
+            else:
+                # 'spawn' en lugar de fork: el detector puede usarse desde hilos (ej. EjecucionMultiCiudad)
+                with ProcessPoolExecutor(max_workers=self.procesos, mp_context=multiprocessing.get_context("spawn")) as executor:
+                    resultados = list(executor.map(_detectar_lote, lotes))
+
+            detectados = [idioma for lote in resultados for idioma in lote]
+            self.cache.update(zip(claves, detectados))
+            self._guardar_cache()
+            self.log.info(f"[LANG] - Detección completada en {len(lotes)} lotes.")
+
+        idiomas[evaluables] = hashes.map(self.cache).values
+        self.log.info(f"[LANG] - Distribución de idiomas: {idiomas.value_counts().head(5).to_dict()}")
+        return idiomas
@@ -6,8 +6,16 @@ from database import DatabaseMongo, DatabaseSQL
 from extracciones import Extracciones
 from carga import Cargas
 from transformaciones import Transformaciones
+from cache_etapas import CacheEtapas
+from gold import Gold
+from sabana import Sabana
+from streaming import PipelineStreaming
+from recarga import RecargaSilver
+from idiomas import DetectorIdioma
 import pandas as pd
 import os
+import argparse
+from functools import partial
 from dotenv import load_dotenv
 
 # Cargar variables de entorno desde el archivo .env
@@ -20,60 +28,295 @@ SQL_USER = os.getenv("USER")
 SQL_PASSWORD = os.getenv("PASSWORD")
 SERVER = os.getenv("SERVER")
 
-if __name__ == "__main__":
+# Rangos de fechas de la ejecución
+CALENDAR_INICIO, CALENDAR_FIN = "2025-06-26", "2025-06-26"
+REVIEWS_INICIO, REVIEWS_FIN = "2016-01-01", "2016-05-30"
+
+# Configuración de la ejecución por defecto (Ciudad de México).
+# data_dir y logs_dir en None usan ../data y ../logs.
+# muestra: fracción de listings a extraer (ej. 0.01) para ejecuciones de desarrollo; None = completo.
+# motor: motor de Transformaciones, 'pandas' o 'polars' (ver motores.py).
+# idiomas: enruta reviews por idioma (DetectorIdioma); solo el inglés se puntúa con VADER y el
+#   resto queda como 'No_Evaluado' mientras no haya un puntuador para su idioma.
+CIUDAD_POR_DEFECTO = {
+    "nombre": "mx",
+    "db_mongo": "bi_mx",
+    "schema": "dbo",
+    "prefijo_tablas": "",
+    "calendar_inicio": CALENDAR_INICIO,
+    "calendar_fin": CALENDAR_FIN,
+    "reviews_inicio": REVIEWS_INICIO,
+    "reviews_fin": REVIEWS_FIN,
+    "data_dir": None,
+    "logs_dir": None,
+    "muestra": None,
+    "semilla": 0,
+    "motor": "pandas",
+    "idiomas": True,
+}
+
+# Prefijo de las tablas SQL (silver y gold) de las ejecuciones con muestra
+PREFIJO_MUESTRA = "muestra_"
+
+
+def aislar_muestra(ciudad):
+    """
+    Con muestra, redirige todas las salidas a `<data_dir>/muestra` (CSV, Excel, Parquet
+    silver y sábana) y a tablas con prefijo PREFIJO_MUESTRA (silver y gold), para que una
+    ejecución de desarrollo nunca sobrescriba las salidas de producción.
+    Sin muestra retorna la configuración sin cambios.
+    """
+    if not ciudad["muestra"]:
+        return ciudad
+    data_dir = ciudad["data_dir"] or os.path.join(os.path.dirname(__file__), "..", "data")
+    return {
+        **ciudad,
+        "data_dir": os.path.join(data_dir, "muestra"),
+        "prefijo_tablas": f"{PREFIJO_MUESTRA}{ciudad['prefijo_tablas']}",
+    }
+
+
+def _transformar_en_proceso(motor, logs_dir, etapa, df, params):
+    """
+    Ejecuta una etapa de Transformaciones en un proceso de trabajo.
+    Se define a nivel de módulo para poder enviarse a un pool de procesos.
+    """
+    transf = Transformaciones(motor=motor, logs_dir=logs_dir)
+    return getattr(transf, etapa)(df, **params)
+
+
+def _construir_sabana(data_dir, logs_dir, df_listings, df_calendar, df_reviews):
+    """Construye y guarda la sábana en un proceso de trabajo (no retorna el DataFrame)."""
+    Sabana(data_dir=data_dir, logs_dir=logs_dir).construir(df_listings, df_calendar, df_reviews)
+
+
+def _ejecutar_en_pool(pool, motor, logs_dir, funcion, df, **params):
+    """Envía una etapa (método de Transformaciones) al pool y espera su resultado."""
+    return pool.submit(_transformar_en_proceso, motor, logs_dir, funcion.__name__, df, params).result()
+
+
+def ejecutor_en_pool(pool, motor, logs_dir=None):
+    """
+    Ejecutor para CacheEtapas.ejecutar que calcula cada etapa en `pool`
+    (ProcessPoolExecutor) con una instancia de Transformaciones propia del proceso.
+    """
+    return partial(_ejecutar_en_pool, pool, motor, logs_dir)
+
+
+def ejecutar_batch(ciudad=None, mongo=None, pool_cpu=None):
+    """
+    Ejecución por etapas: cada etapa termina completamente antes de iniciar la siguiente.
+
+    Parámetros:
+    -----------
+    ciudad : dict, opcional
+        Configuración de la ciudad (ver CIUDAD_POR_DEFECTO). Las claves omitidas toman el valor por defecto.
+    mongo : DatabaseMongo, opcional
+        Conexión compartida ya establecida (se reutiliza su cliente con los logs de la ciudad).
+        Si es None se abre y cierra una conexión propia.
+    pool_cpu : concurrent.futures.ProcessPoolExecutor, opcional
+        Pool de procesos compartido entre ciudades para las etapas de CPU (transformaciones
+        y sábana). Sin pool se ejecutan en el proceso actual.
+    """
+    ciudad = aislar_muestra({**CIUDAD_POR_DEFECTO, **(ciudad or {})})
+    db_name = ciudad["db_mongo"]
+    schema = ciudad["schema"]
+    prefijo = ciudad["prefijo_tablas"]
+    data_dir = ciudad["data_dir"]
+    logs_dir = ciudad["logs_dir"]
 
     # =========================================================================
     # EXTRACCIONES
     # =========================================================================
-    mongo = DatabaseMongo(uri=MONGO_URI)
-    mongo.connect()
-    extr = Extracciones(mongo)
-    df = extr.extraer_coleccion("bi_mx", "listings")
-    df = extr.extraer_calendar_rango_mongo("bi_mx", "calendar", "2025-06-26", "2025-06-26")
-    df_reviews = extr.extraer_coleccion("bi_mx", "reviews")
-    mongo.close()
+    mongo_propio = mongo is None
+    if mongo_propio:
+        mongo = DatabaseMongo(uri=MONGO_URI, logs_dir=logs_dir)
+        mongo.connect()
+    else:
+        mongo = mongo.con_logs(logs_dir)
+    mongo.asegurar_indices(db_name)
+    extr = Extracciones(mongo, data_dir=data_dir, logs_dir=logs_dir)
+    if ciudad["muestra"]:
+        extr.configurar_muestra(db_name, ciudad["muestra"], ciudad["semilla"])
+    df = extr.extraer_coleccion(db_name, "listings")
+    df = extr.extraer_calendar_rango_mongo(db_name, "calendar", ciudad["calendar_inicio"], ciudad["calendar_fin"])
+    df_reviews = extr.extraer_coleccion(db_name, "reviews")
+    if mongo_propio:
+        mongo.close()
 
     # =========================================================================
     # TRANSFORMACIONES
     # =========================================================================
-    transf = Transformaciones()
+    transf = Transformaciones(motor=ciudad["motor"], logs_dir=logs_dir)
+    cache = CacheEtapas(logs_dir=logs_dir)
+    # En el pool, cada etapa ocupa un solo proceso: la detección de idioma corre en serie dentro de él
+    detector = DetectorIdioma(procesos=1 if pool_cpu else None, logs_dir=logs_dir) if ciudad["idiomas"] else None
+    ejecutor = ejecutor_en_pool(pool_cpu, ciudad["motor"], logs_dir) if pool_cpu else None
 
-    base_dir = os.path.dirname(__file__) 
-    parent_dir = os.path.dirname(base_dir)  
-    raw_dir = os.path.join(parent_dir, "data", "raw") 
+    raw_dir = os.path.join(extr.data_dir, "raw")
 
     # Listings
     df_listings = pd.read_csv(os.path.join(raw_dir, "listings.csv"), sep=",", encoding="utf-8-sig")
-    df_listings_transf = transf.transformaciones_listings(df_listings)
+    df_listings_transf = cache.ejecutar(transf.transformaciones_listings, df_listings, ejecutor=ejecutor)
 
     # Calendar
     df_calendar = pd.read_csv(os.path.join(raw_dir, "calendar.csv"), sep=",", encoding="utf-8-sig")
-    df_calendar_transf = transf.transformaciones_calendar(df_calendar)
+    df_calendar_transf = cache.ejecutar(transf.transformaciones_calendar, df_calendar, ejecutor=ejecutor)
 
     # Reviews
     df_reviews = pd.read_csv(os.path.join(raw_dir, "reviews.csv"), sep=",", encoding="utf-8-sig")
-    df_reviews['date'] = pd.to_datetime(df_reviews['date'], errors='coerce')
+    # Mismo formato de fecha que las transformaciones (ver motores.PATRON_FECHA)
+    df_reviews['date'] = transf.motor.convertir_fecha(df_reviews, 'date')
     df_reviews_filtrado = df_reviews[
-        (df_reviews['date'] >= "2016-01-01") & (df_reviews['date'] <= "2016-05-30")
+        (df_reviews['date'] >= ciudad["reviews_inicio"]) & (df_reviews['date'] <= ciudad["reviews_fin"])
     ]
-    df_reviews_transf = transf.transformaciones_reviews(df_reviews_filtrado)
+    df_reviews_transf = cache.ejecutar(
+        transf.transformaciones_reviews, df_reviews_filtrado, ejecutor=ejecutor, detector=detector
+    )
 
     # =========================================================================
     # CARGAS
     # =========================================================================
-    carg = Cargas()
+    carg = Cargas(data_dir=data_dir, logs_dir=logs_dir)
     carg.cargar_silver(df_listings_transf, "listings")
     carg.cargar_silver(df_calendar_transf, "calendar")
     carg.cargar_silver(df_reviews_transf, "reviews")
 
-    # SQL Server
+    # SQL Server (pyodbc reutiliza las conexiones físicas mediante el pool de ODBC)
+    sql = DatabaseSQL(
+        server=SERVER,
+        database=SQL_DATABASE,
+        username=SQL_USER,
+        password=SQL_PASSWORD,
+        logs_dir=logs_dir
+    )
+    carg.cargar_sql(df_listings_transf, f"{prefijo}silver_listings", schema, sql)
+    carg.cargar_sql(df_calendar_transf, f"{prefijo}silver_calendar", schema, sql)
+    carg.cargar_sql(df_reviews_transf, f"{prefijo}silver_reviews", schema, sql)
+
+    # =========================================================================
+    # GOLD (agregados incrementales por listing y mes)
+    # =========================================================================
+    gold = Gold(logs_dir=logs_dir)
+    df_gold_ocupacion = gold.construir_ocupacion_mensual(df_calendar_transf)
+    df_gold_sentimiento = gold.construir_sentimiento_mensual(df_reviews_transf)
+    gold.cargar_incremental(
+        df_gold_ocupacion, f"{prefijo}gold_ocupacion_mensual", schema, sql,
+        ciudad["calendar_inicio"], ciudad["calendar_fin"]
+    )
+    gold.cargar_incremental(
+        df_gold_sentimiento, f"{prefijo}gold_sentimiento_mensual", schema, sql,
+        ciudad["reviews_inicio"], ciudad["reviews_fin"]
+    )
+
+    # =========================================================================
+    # SÁBANA (listings + calendar + reviews por listing y mes, en Parquet)
+    # =========================================================================
+    if pool_cpu:
+        pool_cpu.submit(
+            _construir_sabana, data_dir, logs_dir, df_listings_transf, df_calendar_transf, df_reviews_transf
+        ).result()
+    else:
+        Sabana(data_dir=data_dir, logs_dir=logs_dir).construir(df_listings_transf, df_calendar_transf, df_reviews_transf)
+
+
+def ejecutar_streaming(muestra=None, semilla=0, motor="pandas", idiomas=True):
+    """
+    Ejecución en flujo: calendar y reviews pasan de MongoDB a SQL por lotes, solapando
+    extracción, transformación y carga con memoria acotada. Listings (tabla pequeña que
+    necesita el conjunto completo) se procesa por etapas.
+
+    muestra (opcional) limita la ejecución a una fracción determinista de listings;
+    sus CSV y tablas SQL quedan separados de los de producción (ver aislar_muestra).
+    motor (opcional) elige el motor de Transformaciones, también en los procesos de trabajo.
+    idiomas (opcional) enruta reviews por idioma (ver CIUDAD_POR_DEFECTO).
+    """
+    ciudad = aislar_muestra({**CIUDAD_POR_DEFECTO, "muestra": muestra, "semilla": semilla})
+    prefijo = ciudad["prefijo_tablas"]
+    mongo = DatabaseMongo(uri=MONGO_URI)
+    mongo.connect()
+    mongo.asegurar_indices("bi_mx")
+    extr = Extracciones(mongo, data_dir=ciudad["data_dir"])
+    if muestra:
+        extr.configurar_muestra("bi_mx", muestra, semilla)
     sql = DatabaseSQL(
         server=SERVER,
         database=SQL_DATABASE,
         username=SQL_USER,
         password=SQL_PASSWORD
     )
-    carg.cargar_sql(df_listings_transf, "silver_listings", "dbo", sql)
-    carg.cargar_sql(df_calendar_transf, "silver_calendar", "dbo", sql)
-    carg.cargar_sql(df_reviews_transf, "silver_reviews", "dbo", sql)
 
+    # Listings
+    df_listings = extr.extraer_coleccion("bi_mx", "listings")
+    df_listings_transf = Transformaciones(motor=motor).transformaciones_listings(df_listings)
+    Cargas().cargar_sql(df_listings_transf, f"{prefijo}silver_listings", "dbo", sql)
+
+    # Calendar y reviews por lotes
+    pipeline = PipelineStreaming(extr, sql, motor=motor, idiomas=idiomas)
+    pipeline.ejecutar(
+        "bi_mx", "calendar", "calendar", f"{prefijo}silver_calendar", "dbo",
+        query={"date": {"$gte": pd.to_datetime(CALENDAR_INICIO), "$lte": pd.to_datetime(CALENDAR_FIN)}}
+    )
+    pipeline.ejecutar(
+        "bi_mx", "reviews", "reviews", f"{prefijo}silver_reviews", "dbo",
+        query={"date": {"$gte": pd.to_datetime(REVIEWS_INICIO), "$lte": pd.to_datetime(REVIEWS_FIN)}}
+    )
+    mongo.close()
+
+
+def ejecutar_recarga(ciudad=None):
+    """
+    Solo carga: recarga las tablas silver de SQL desde los Parquet de data/silver
+    generados por la última ejecución batch, retomando desde el último lote confirmado.
+
+    Parámetros:
+    -----------
+    ciudad : dict, opcional
+        Configuración de la ciudad (ver CIUDAD_POR_DEFECTO). Con 'muestra' se recargan los
+        Parquet y las tablas de la muestra (ver aislar_muestra).
+    """
+    ciudad = aislar_muestra({**CIUDAD_POR_DEFECTO, **(ciudad or {})})
+    sql = DatabaseSQL(
+        server=SERVER,
+        database=SQL_DATABASE,
+        username=SQL_USER,
+        password=SQL_PASSWORD,
+        logs_dir=ciudad["logs_dir"]
+    )
+    recarga = RecargaSilver(sql, data_dir=ciudad["data_dir"], logs_dir=ciudad["logs_dir"])
+    resultados = recarga.recargar_todo(prefijo=ciudad["prefijo_tablas"], schema=ciudad["schema"])
+    for nombre, completa in resultados.items():
+        print(f"{nombre}: {'OK' if completa else 'incompleta (volver a ejecutar --modo recarga)'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ETL Airbnb: MongoDB -> transformaciones -> Azure SQL.")
+    parser.add_argument(
+        "--modo", choices=["batch", "streaming", "recarga"], default="batch",
+        help="batch: etapas completas con CSV/Excel intermedios. streaming: lotes en flujo de MongoDB a SQL. "
+             "recarga: solo carga a SQL desde los Parquet silver de la última ejecución batch."
+    )
+    parser.add_argument(
+        "--muestra", type=float, default=None,
+        help="Fracción de listings a procesar (ej. 0.01) con la misma selección en listings, calendar y reviews. "
+             f"Pensado para desarrollo: las salidas van a data/muestra y a tablas con prefijo '{PREFIJO_MUESTRA}', "
+             "sin tocar las de producción. Con --modo recarga, recarga las tablas de la muestra."
+    )
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del muestreo por hash de listing_id.")
+    parser.add_argument(
+        "--motor", choices=["pandas", "polars"], default=CIUDAD_POR_DEFECTO["motor"],
+        help="Motor de Transformaciones (polars requiere el paquete opcional polars)."
+    )
+    parser.add_argument(
+        "--idiomas", action=argparse.BooleanOptionalAction, default=CIUDAD_POR_DEFECTO["idiomas"],
+        help="Detectar el idioma de reviews y puntuar con VADER solo los comentarios en inglés "
+             "(--no-idiomas puntúa todos con VADER)."
+    )
+    args = parser.parse_args()
+
+    if args.modo == "streaming":
+        ejecutar_streaming(args.muestra, args.semilla, args.motor, args.idiomas)
+    elif args.modo == "recarga":
+        ejecutar_recarga({"muestra": args.muestra})
+    else:
+        ejecutar_batch({"muestra": args.muestra, "semilla": args.semilla, "motor": args.motor, "idiomas": args.idiomas})
@@ -0,0 +1,194 @@
+import pandas as pd
+import numpy as np
+
+
+# ===========================================================
+# 🔹 Motores de DataFrame para Transformaciones
+# Operaciones columnares (limpieza numérica, fechas y filtros de outliers)
+# con una implementación de referencia en pandas y otra en Polars.
+# Ambos motores reciben y devuelven objetos de pandas con el mismo índice,
+# de modo que Transformaciones no depende del motor elegido.
+# ===========================================================
+
+# Formato de fecha aceptado por ambos motores: ISO 8601 'YYYY-MM-DD', opcionalmente con
+# hora 'HH:MM:SS' (separada por espacio o 'T') y fracción de segundos. Cualquier otro
+# texto (u otra fecha imposible, ej. '2025-02-30') queda como NaT en los dos motores,
+# en lugar de depender del formato que cada biblioteca infiere a partir del primer valor.
+PATRON_FECHA = r"^\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}:\d{2}(?:\.\d{1,9})?)?$"
+
+class MotorPandas:
+    """Motor de referencia: operaciones vectorizadas de pandas."""
+
+    nombre = "pandas"
+
+    def limpiar_numerico(self, df, columna, quitar, coerce=False):
+        """
+        Elimina los caracteres indicados de una columna de texto y la convierte a float.
+
+        Parámetros:
+        -----------
+        df : pd.DataFrame -> DataFrame de origen.
+        columna : str -> Columna a limpiar.
+        quitar : list -> Cadenas literales a eliminar (ej. ['$', ',']).
+        coerce : bool -> Si es True los valores no numéricos quedan como NaN; si no, se lanza un error.
+
+        Retorna:
+        --------
+        pd.Series -> Columna numérica con el mismo índice del DataFrame.
+        """
+        serie = df[columna].astype(str)
+        for caracter in quitar:
+            serie = serie.str.replace(caracter, '', regex=False)
+        if coerce:
+            return pd.to_numeric(serie, errors='coerce').astype(float)
+        return serie.astype(float)
+
+    def convertir_fecha(self, df, columna):
+        """
+        Convierte una columna a datetime64[ns] según PATRON_FECHA; los valores inválidos quedan como NaT.
+        Las columnas que ya son datetime solo se llevan a resolución de nanosegundos.
+        """
+        serie = df[columna]
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            return serie.astype('datetime64[ns]')
+        texto = serie.astype(str).str.strip()
+        valido = texto.str.match(PATRON_FECHA).fillna(False).astype(bool)
+        fechas = pd.to_datetime(texto.where(valido), errors='coerce', format='ISO8601')
+        return fechas.astype('datetime64[ns]')
+
+    def componentes_fecha(self, df, columna, componentes):
+        """
+        Desagrega una columna datetime en sus componentes.
+
+        Parámetros:
+        -----------
+        df : pd.DataFrame -> DataFrame de origen.
+        columna : str -> Columna datetime.
+        componentes : dict -> Nombre de la columna destino -> componente ('year', 'month', 'day').
+
+        Retorna:
+        --------
+        pd.DataFrame -> Una columna por componente, con el mismo índice del DataFrame.
+        """
+        return pd.DataFrame(
+            {destino: getattr(df[columna].dt, parte) for destino, parte in componentes.items()},
+            index=df.index
+        )
+
+    def mascara_limites(self, df, columnas, maximo, inclusivo=True, conservar_nulos=True):
+        """
+        Calcula la máscara de filas a conservar según un límite superior.
+
+        Parámetros:
+        -----------
+        df : pd.DataFrame -> DataFrame de origen.
+        columnas : list -> Columnas evaluadas; se descarta la fila si cualquiera supera el límite.
+        maximo : float -> Límite superior.
+        inclusivo : bool -> Si es True se conserva el valor igual al máximo.
+        conservar_nulos : bool -> Si es True las filas con nulos en la columna se conservan.
+
+        Retorna:
+        --------
+        np.ndarray -> Máscara booleana alineada con las filas del DataFrame.
+        """
+        conservar = np.ones(len(df), dtype=bool)
+        for col in columnas:
+            valores = df[col]
+            dentro = (valores <= maximo) if inclusivo else (valores < maximo)
+            if conservar_nulos:
+                dentro = dentro | valores.isna()
+            conservar &= dentro.fillna(False).to_numpy(dtype=bool)
+        return conservar
+
+
+class MotorPolars:
+    """
+    Motor columnar basado en Polars/Arrow.
+    Las expresiones se ejecutan en modo lazy y en paralelo; solo se convierten
+    a Polars las columnas involucradas en cada operación.
+    """
+
+    nombre = "polars"
+
+    def __init__(self):
+        # Polars es opcional: se importa solo si se elige este motor
+        import polars as pl
+        self.pl = pl
+
+    def _a_polars(self, df, columnas):
+        """Convierte a Polars solo las columnas necesarias."""
+        return self.pl.from_pandas(df[columnas], include_index=False).lazy()
+
+    def _a_serie(self, lf, columna, index):
+        """Materializa una columna del plan lazy como pd.Series con el índice original."""
+        serie = lf.select(columna).collect()[columna].to_pandas()
+        serie.index = index
+        return serie
+
+    def limpiar_numerico(self, df, columna, quitar, coerce=False):
+        """Equivalente en Polars de MotorPandas.limpiar_numerico."""
+        pl = self.pl
+        expr = pl.col(columna).cast(pl.String)
+        for caracter in quitar:
+            expr = expr.str.replace_all(caracter, '', literal=True)
+        # pandas convierte el texto 'nan' (nulos) a NaN; se replica con un cast a Float64
+        expr = expr.cast(pl.Float64, strict=not coerce).alias(columna)
+        serie = self._a_serie(self._a_polars(df, [columna]).with_columns(expr), columna, df.index)
+        return serie.astype(float)
+
+    def convertir_fecha(self, df, columna):
+        """Equivalente en Polars de MotorPandas.convertir_fecha."""
+        pl = self.pl
+        lf = self._a_polars(df, [columna])
+        tipo = lf.collect_schema()[columna]
+        if isinstance(tipo, pl.Datetime):
+            expr = pl.col(columna).cast(pl.Datetime("ns"))
+        else:
+            # Mismo formato que MotorPandas: se valida con PATRON_FECHA y se usan formatos explícitos
+            texto = pl.col(columna).cast(pl.String).str.strip_chars()
+            normalizado = texto.str.replace("T", " ", literal=True)
+            expr = pl.when(texto.str.contains(PATRON_FECHA)).then(pl.coalesce(
+                normalizado.str.strptime(pl.Datetime("ns"), "%Y-%m-%d %H:%M:%S%.f", strict=False),
+                normalizado.str.strptime(pl.Datetime("ns"), "%Y-%m-%d", strict=False),
+            ))
+        return self._a_serie(lf.with_columns(expr.alias(columna)), columna, df.index)
+
+    def componentes_fecha(self, df, columna, componentes):
+        """Equivalente en Polars de MotorPandas.componentes_fecha."""
+        pl = self.pl
+        # pandas retorna int32 para todos los componentes (Polars usa Int8 para mes y día)
+        exprs = [getattr(pl.col(columna).dt, parte)().cast(pl.Int32).alias(destino) for destino, parte in componentes.items()]
+        resultado = self._a_polars(df, [columna]).select(exprs).collect().to_pandas()
+        resultado.index = df.index
+        return resultado
+
+    def mascara_limites(self, df, columnas, maximo, inclusivo=True, conservar_nulos=True):
+        """Equivalente en Polars de MotorPandas.mascara_limites."""
+        pl = self.pl
+        condiciones = []
+        for col in columnas:
+            dentro = (pl.col(col) <= maximo) if inclusivo else (pl.col(col) < maximo)
+            if conservar_nulos:
+                dentro = dentro | pl.col(col).is_null()
+            condiciones.append(dentro.fill_null(False))
+        lf = self._a_polars(df, columnas).select(pl.all_horizontal(condiciones).alias("conservar"))
+        return lf.collect()["conservar"].to_numpy().astype(bool)
+
+
+MOTORES = {
+    "pandas": MotorPandas,
+    "polars": MotorPolars,
+}
+
+
+def crear_motor(nombre="pandas"):
+    """
+    Crea una instancia del motor indicado.
+
+    Parámetros:
+    -----------
+    nombre : str -> 'pandas' (referencia) o 'polars'.
+    """
+    if nombre not in MOTORES:
+        raise ValueError(f"Motor '{nombre}' no soportado. Opciones: {list(MOTORES.keys())}")
+    return MOTORES[nombre]()
@@ -0,0 +1,158 @@
+# =============================================================================
+# Ejecución del ETL para varias ciudades de Inside Airbnb
+# =============================================================================
+#
+# Uso:
+#   python multiciudad.py --config ciudades.json --max-ciudades 3 --max-cpu 2
+#
+# ciudades.json es una lista de configuraciones (mismas claves que
+# main.CIUDAD_POR_DEFECTO; las omitidas toman el valor por defecto):
+#   [
+#     {"nombre": "mx", "db_mongo": "bi_mx", "prefijo_tablas": "mx_"},
+#     {"nombre": "bue", "db_mongo": "bi_bue", "schema": "bue"}
+#   ]
+
+import os
+import json
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from logs_bi import Logs
+from database import DatabaseMongo
+from main import ejecutar_batch, MONGO_URI, CIUDAD_POR_DEFECTO
+
+
+class EjecucionMultiCiudad:
+    """
+    Ejecuta Extracciones -> Transformaciones -> Cargas para varias ciudades en paralelo.
+
+    - Cada ciudad corre en su propio hilo, hasta `max_ciudades` a la vez. Los hilos
+      solapan la E/S: extracción de MongoDB, cargas a SQL y archivos.
+    - Todas comparten un único cliente de MongoDB (pool de conexiones thread-safe);
+      las conexiones a SQL se reutilizan mediante el pool de ODBC del proceso.
+    - Las etapas de CPU (transformaciones, incluida la detección de idioma, y sábana) se
+      envían a un pool de `max_cpu` procesos compartido por todas las ciudades, de modo
+      que usan hasta `max_cpu` núcleos sin depender del GIL ni sobrepasar ese límite.
+      Los DataFrames de cada etapa se copian hacia y desde el proceso de trabajo.
+    - Cada ciudad escribe sus CSV/Excel en data/ciudades/<nombre> y todos sus logs
+      (incluidos MongoDB y la caché de etapas) en logs/<nombre>.
+    - Las tablas SQL de cada ciudad se separan por esquema o prefijo: si la configuración
+      no indica ninguno de los dos, el prefijo es '<nombre>_'. Dos ciudades con el mismo
+      (schema, prefijo_tablas) se rechazan antes de empezar.
+    """
+
+    def __init__(self, ciudades, max_ciudades=2, max_cpu=None):
+        """
+        Constructor de la clase EjecucionMultiCiudad.
+
+        Parámetros:
+        -----------
+        ciudades : list
+            Configuraciones de ciudad (dict con al menos 'nombre' y 'db_mongo').
+        max_ciudades : int, opcional
+            Ciudades procesadas en paralelo.
+        max_cpu : int, opcional
+            Procesos del pool de etapas de CPU, es decir, núcleos usados a la vez por las
+            transformaciones (por defecto: la mitad de los núcleos, mínimo 1).
+        """
+        self.ciudades = ciudades
+        self.max_ciudades = max_ciudades
+        self.max_cpu = max_cpu or max(1, (os.cpu_count() or 2) // 2)
+
+        self.base_dir = os.path.join(os.path.dirname(__file__), "..")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        logs_dir = os.path.join(self.base_dir, "logs")
+        os.makedirs(logs_dir, exist_ok=True)
+        log_filename = f"logs_{timestamp}.txt"
+        self.log = Logs(os.path.join(logs_dir, log_filename))
+
+        self.log.info(
+            f"[INIT] - Clase EjecucionMultiCiudad inicializada: {len(ciudades)} ciudades, "
+            f"{self.max_ciudades} en paralelo, {self.max_cpu} procesos para etapas de CPU."
+        )
+
+    def _configurar(self, ciudad):
+        """Completa las rutas de datos y logs y el prefijo de tablas propios de cada ciudad."""
+        ciudad = dict(ciudad)
+        nombre = ciudad["nombre"]
+        if "prefijo_tablas" not in ciudad and "schema" not in ciudad:
+            ciudad["prefijo_tablas"] = f"{nombre}_"
+        ciudad.setdefault("data_dir", os.path.join(self.base_dir, "data", "ciudades", nombre))
+        ciudad.setdefault("logs_dir", os.path.join(self.base_dir, "logs", nombre))
+        os.makedirs(ciudad["data_dir"], exist_ok=True)
+        os.makedirs(ciudad["logs_dir"], exist_ok=True)
+        return ciudad
+
+    def _validar_destinos(self, configs):
+        """Verifica que ninguna ciudad escriba en las mismas tablas SQL que otra."""
+        destinos = {}
+        for config in configs:
+            destino = (
+                config.get("schema", CIUDAD_POR_DEFECTO["schema"]),
+                config.get("prefijo_tablas", CIUDAD_POR_DEFECTO["prefijo_tablas"]),
+            )
+            if destino in destinos:
+                mensaje = (
+                    f"Las ciudades '{destinos[destino]}' y '{config['nombre']}' escriben en las mismas tablas "
+                    f"(schema '{destino[0]}', prefijo '{destino[1]}'). Indica un schema o prefijo_tablas distinto."
+                )
+                self.log.error(f"[MULTI] - {mensaje}")
+                raise ValueError(mensaje)
+            destinos[destino] = config["nombre"]
+
+    def ejecutar(self):
+        """
+        Ejecuta todas las ciudades y espera a que terminen.
+
+        Retorna:
+        --------
+        dict -> Nombre de ciudad -> 'OK' o el mensaje de error.
+        """
+        configs = [self._configurar(ciudad) for ciudad in self.ciudades]
+        self._validar_destinos(configs)
+
+        mongo = DatabaseMongo(uri=MONGO_URI)
+        mongo.connect()
+
+        resultados = {}
+        try:
+            # 'spawn': el pool se crea desde un proceso con hilos (cliente de MongoDB, ciudades)
+            with ProcessPoolExecutor(
+                max_workers=self.max_cpu, mp_context=multiprocessing.get_context("spawn")
+            ) as pool_cpu, ThreadPoolExecutor(max_workers=self.max_ciudades) as executor:
+                futuros = {}
+                for config in configs:
+                    self.log.info(f"[MULTI] - Ciudad '{config['nombre']}' en cola (base Mongo: {config['db_mongo']}).")
+                    futuros[executor.submit(ejecutar_batch, config, mongo, pool_cpu)] = config["nombre"]
+
+                for futuro in as_completed(futuros):
+                    nombre = futuros[futuro]
+                    try:
+                        futuro.result()
+                        resultados[nombre] = "OK"
+                        self.log.info(f"[MULTI] - Ciudad '{nombre}' completada.")
+                    except Exception as e:
+                        # El fallo de una ciudad no detiene a las demás
+                        resultados[nombre] = f"{type(e).__name__} - {e}"
+                        self.log.error(f"[MULTI] - Error en la ciudad '{nombre}': {type(e).__name__} - {e}")
+        finally:
+            mongo.close()
+
+        self.log.info(f"[MULTI] - Resumen: {resultados}")
+        return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ETL Airbnb para varias ciudades.")
+    parser.add_argument("--config", required=True, help="Archivo JSON con la lista de ciudades.")
+    parser.add_argument("--max-ciudades", type=int, default=2, help="Ciudades procesadas en paralelo.")
+    parser.add_argument("--max-cpu", type=int, default=None, help="Procesos para las etapas de CPU (por defecto: la mitad de los núcleos).")
+    args = parser.parse_args()
+
+    with open(args.config, encoding="utf-8") as f:
+        ciudades = json.load(f)
+
+    resultados = EjecucionMultiCiudad(ciudades, args.max_ciudades, args.max_cpu).ejecutar()
+    for nombre, estado in resultados.items():
+        print(f"{nombre}: {estado}")
@@ -0,0 +1,197 @@
+import os
+import json
+from datetime import datetime
+from logs_bi import Logs
+from database import DatabaseSQL
+from cache_etapas import restaurar_columnas
+
+
+class RecargaSilver:
+    """
+    Recarga las tablas silver de SQL a partir de los archivos Parquet de `data/silver`,
+    sin repetir la extracción de MongoDB ni las transformaciones.
+
+    - El Parquet se lee por lotes (pyarrow iter_batches); solo un lote a la vez se
+      convierte a pandas y se inserta con DatabaseSQL.insert_chunk.
+    - Tras cada lote confirmado se actualiza un checkpoint JSON. Si la carga falla,
+      la siguiente ejecución continúa desde el último lote confirmado (el checkpoint se
+      escribe después del commit: una caída entre ambos puede repetir ese único lote).
+    - El checkpoint se descarta si el archivo silver cambió o si cambia el tamaño de lote.
+    - Cada lote se normaliza como en la carga batch: las listas vuelven a ser listas (no
+      ndarray) y los nulos de texto son NaN (no None), ver cache_etapas.restaurar_columnas.
+    - Un Parquet sin filas deja la tabla destino creada y vacía.
+    """
+
+    ARCHIVOS = ("listings", "calendar", "reviews")
+
+    def __init__(self, sql_instance, data_dir=None, logs_dir=None, tam_lote=DatabaseSQL.FILAS_LOTE_COLUMNSTORE):
+        """
+        Constructor de la clase RecargaSilver.
+
+        Parámetros:
+        -----------
+        sql_instance : DatabaseSQL
+            Instancia de conexión a SQL (se conecta y cierra en cada recarga).
+        data_dir : str, opcional
+            Carpeta base de datos; los Parquet se leen de `data_dir/silver` (por defecto: ../data).
+        logs_dir : str, opcional
+            Carpeta de logs (por defecto: ../logs).
+        tam_lote : int, opcional
+            Filas por lote insertado (y por checkpoint); por defecto el lote columnstore de DatabaseSQL.
+        """
+        if data_dir is None:
+            data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+        self.silver_dir = os.path.join(data_dir, "silver")
+        self.checkpoint_dir = os.path.join(self.silver_dir, "_checkpoints")
+        self.sql = sql_instance
+        self.tam_lote = tam_lote
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if logs_dir is None:
+            logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+        os.makedirs(logs_dir, exist_ok=True)
+        log_filename = f"logs_{timestamp}.txt"
+        self.log = Logs(os.path.join(logs_dir, log_filename))
+
+        self.log.info(f"[INIT] - Clase RecargaSilver inicializada (silver: {self.silver_dir}, lote: {tam_lote}).")
+
+    def _ruta_checkpoint(self, table_name, schema):
+        """Ruta del checkpoint de una tabla destino."""
+        return os.path.join(self.checkpoint_dir, f"{schema}.{table_name}.json")
+
+    def _firma(self, parquet_path):
+        """Identifica la versión del archivo silver (tamaño y fecha de modificación)."""
+        stat = os.stat(parquet_path)
+        return f"{stat.st_size}-{int(stat.st_mtime)}"
+
+    def _leer_checkpoint(self, ruta, firma):
+        """Retorna el checkpoint vigente o None si no existe o corresponde a otro archivo/tamaño de lote."""
+        if not os.path.exists(ruta):
+            return None
+        try:
+            with open(ruta, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            self.log.error(f"[RELOAD] - Checkpoint ilegible {ruta}, se recarga desde el inicio: {type(e).__name__} - {e}")
+            return None
+        if checkpoint.get("firma") != firma or checkpoint.get("tam_lote") != self.tam_lote:
+            self.log.info(f"[RELOAD] - Checkpoint {ruta} no corresponde al silver actual; se recarga desde el inicio.")
+            return None
+        return checkpoint
+
+    def _guardar_checkpoint(self, ruta, checkpoint):
+        """Escribe el checkpoint de forma atómica."""
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        ruta_tmp = f"{ruta}.tmp"
+        with open(ruta_tmp, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(ruta_tmp, ruta)
+
+    def _preparar_tabla(self, df, table_name, schema, ruta_checkpoint, checkpoint):
+        """Crea o vacía la tabla al iniciar una carga nueva y lo registra en el checkpoint."""
+        if not self.sql.prepare_table(df, table_name, schema):
+            return False
+        checkpoint["tabla_preparada"] = True
+        self._guardar_checkpoint(ruta_checkpoint, checkpoint)
+        return True
+
+    def recargar(self, file_name, table_name, schema="dbo"):
+        """
+        Carga un archivo silver Parquet en una tabla SQL, retomando desde el checkpoint si existe.
+        Requiere una conexión activa (ver recargar_todo).
+
+        Parámetros:
+        -----------
+        file_name : str
+            Nombre del archivo silver (sin extensión), ej. 'calendar'.
+        table_name : str
+            Tabla destino.
+        schema : str, opcional
+            Esquema de base de datos.
+
+        Retorna:
+        --------
+        bool -> True si la tabla quedó completa.
+        """
+        import pyarrow.parquet as pq
+
+        parquet_path = os.path.join(self.silver_dir, f"{file_name}.parquet")
+        if not os.path.exists(parquet_path):
+            self.log.error(f"[RELOAD] - No existe {parquet_path}. Ejecuta primero el ETL en modo batch.")
+            return False
+
+        firma = self._firma(parquet_path)
+        ruta_checkpoint = self._ruta_checkpoint(table_name, schema)
+        checkpoint = self._leer_checkpoint(ruta_checkpoint, firma)
+
+        archivo = pq.ParquetFile(parquet_path)
+        total = archivo.metadata.num_rows
+        if checkpoint is None:
+            checkpoint = {"archivo": parquet_path, "firma": firma, "tam_lote": self.tam_lote,
+                          "lotes_confirmados": 0, "filas_confirmadas": 0, "tabla_preparada": False}
+        else:
+            self.log.info(
+                f"[RELOAD] - Retomando {schema}.{table_name} desde el lote {checkpoint['lotes_confirmados']} "
+                f"({checkpoint['filas_confirmadas']}/{total} filas ya confirmadas)."
+            )
+
+        self.log.info(f"[RELOAD] - Cargando {file_name}.parquet ({total} filas) en {schema}.{table_name}...")
+        for i, lote in enumerate(archivo.iter_batches(batch_size=self.tam_lote)):
+            # Los lotes ya confirmados se saltan sin convertirlos a pandas
+            if i < checkpoint["lotes_confirmados"]:
+                continue
+
+            df = restaurar_columnas(lote.to_pandas())
+            if not checkpoint["tabla_preparada"]:
+                # Crear o vaciar la tabla solo al iniciar una carga nueva
+                if not self._preparar_tabla(df, table_name, schema, ruta_checkpoint, checkpoint):
+                    return False
+
+            if len(df) and self.sql.insert_chunk(df, table_name, schema) == 0:
+                self.log.error(
+                    f"[RELOAD] - Carga de {schema}.{table_name} detenida en el lote {i}. "
+                    f"Vuelve a ejecutar la recarga para continuar desde la fila {checkpoint['filas_confirmadas']}."
+                )
+                return False
+
+            checkpoint["lotes_confirmados"] = i + 1
+            checkpoint["filas_confirmadas"] += len(df)
+            self._guardar_checkpoint(ruta_checkpoint, checkpoint)
+
+        if not checkpoint["tabla_preparada"]:
+            # Parquet sin filas: no hay lotes, pero la tabla debe quedar vacía como en la carga batch
+            df_vacio = restaurar_columnas(archivo.schema_arrow.empty_table().to_pandas())
+            if not self._preparar_tabla(df_vacio, table_name, schema, ruta_checkpoint, checkpoint):
+                return False
+
+        self.sql.compactar_columnstore(table_name, schema)
+        if os.path.exists(ruta_checkpoint):
+            os.remove(ruta_checkpoint)
+        self.log.info(f"[RELOAD] - Tabla {schema}.{table_name} recargada completamente ({checkpoint['filas_confirmadas']} filas).")
+        return True
+
+    def recargar_todo(self, prefijo="", schema="dbo"):
+        """
+        Recarga las tablas silver de listings, calendar y reviews.
+
+        Parámetros:
+        -----------
+        prefijo : str, opcional
+            Prefijo de las tablas destino (ver main.CIUDAD_POR_DEFECTO).
+        schema : str, opcional
+            Esquema de base de datos.
+
+        Retorna:
+        --------
+        dict -> Nombre de archivo -> True si la tabla quedó completa.
+        """
+        self.sql.connect()
+        if self.sql.conn is None:
+            return {nombre: False for nombre in self.ARCHIVOS}
+        try:
+            return {
+                nombre: self.recargar(nombre, f"{prefijo}silver_{nombre}", schema)
+                for nombre in self.ARCHIVOS
+            }
+        finally:
+            self.sql.close()
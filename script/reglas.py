@@ -0,0 +1,167 @@
+import time
+import numpy as np
+import pandas as pd
+
+
+# ===========================================================
+# 🔹 Reglas declarativas de limpieza por columna
+# Cada regla es un dict con 'columna' (o 'columnas' para filtros) y 'regla':
+#   - numerico  : elimina los caracteres de 'quitar' y convierte a float.
+#   - mapear    : reemplaza valores según 'mapa' (opcional: 'destino', 'eliminar_origen').
+#   - recortar  : limita los valores al rango ['minimo', 'maximo'].
+#   - convertir : convierte al 'tipo' indicado (opcional: 'redondeo' = 'techo' | 'piso').
+#   - filtrar   : descarta filas con valores por encima de 'maximo'
+#                 (opcional: 'inclusivo', 'conservar_nulos').
+# Agregar una columna limpia es agregar una regla a la lista correspondiente.
+# ===========================================================
+
+REGLAS_LISTINGS = [
+    {"columna": "host_acceptance_rate", "regla": "numerico", "quitar": ["%"]},
+    {"columna": "host_response_rate", "regla": "numerico", "quitar": ["%"]},
+    {
+        "columna": "host_response_time", "regla": "mapear",
+        "mapa": {
+            "within an hour": "Fast",
+            "within a few hours": "Fast",
+            "within a day": "Moderate",
+            "a few days or more": "Slow",
+        },
+        "destino": "host_response_category", "eliminar_origen": True,
+    },
+    # Solo se eliminan '$' y ','; el punto decimal se conserva ("$1,234.50" -> 1234.5)
+    {"columna": "price", "regla": "numerico", "quitar": ["$", ","]},
+    {"columna": "bathrooms", "regla": "convertir", "tipo": "Int64", "redondeo": "techo"},
+]
+
+FILTROS_LISTINGS = [
+    {"columnas": ["bathrooms", "bedrooms", "beds"], "regla": "filtrar", "maximo": 15},
+    {"columnas": ["price"], "regla": "filtrar", "maximo": 4000000, "inclusivo": False, "conservar_nulos": False},
+]
+
+
+class MotorReglas:
+    """
+    Compila reglas declarativas en un plan por columna y lo ejecuta de forma vectorizada.
+
+    - Las reglas de columna se agrupan por columna y se ejecutan en el orden declarado.
+    - Los filtros de filas se evalúan como máscaras y se combinan en una sola selección.
+    - Cada regla registra su tiempo de ejecución y el número de valores o filas rechazados.
+    """
+
+    REGLAS_COLUMNA = ("numerico", "mapear", "recortar", "convertir")
+
+    def __init__(self, motor, log):
+        """
+        Parámetros:
+        -----------
+        motor : MotorPandas | MotorPolars
+            Motor columnar usado para la limpieza numérica y los filtros.
+        log : Logs
+            Logger de la clase que ejecuta las reglas.
+        """
+        self.motor = motor
+        self.log = log
+        self.ultimo_reporte = pd.DataFrame()
+
+    def compilar(self, reglas):
+        """
+        Valida las reglas y las organiza en un plan.
+
+        Retorna:
+        --------
+        dict -> {'columnas': {columna: [reglas...]}, 'filtros': [reglas...]}
+        """
+        plan = {"columnas": {}, "filtros": []}
+        for regla in reglas:
+            tipo = regla.get("regla")
+            if tipo == "filtrar":
+                plan["filtros"].append(regla)
+            elif tipo in self.REGLAS_COLUMNA:
+                plan["columnas"].setdefault(regla["columna"], []).append(regla)
+            else:
+                raise ValueError(f"Regla '{tipo}' no soportada. Opciones: {self.REGLAS_COLUMNA + ('filtrar',)}")
+        return plan
+
+    def _aplicar_columna(self, df, columna, regla):
+        """Aplica una regla de columna. Retorna el número de valores rechazados."""
+        tipo = regla["regla"]
+        serie = df[columna]
+        no_nulos = int(serie.notna().sum())
+
+        if tipo == "numerico":
+            df[columna] = self.motor.limpiar_numerico(df, columna, regla.get("quitar", []), coerce=True)
+            return no_nulos - int(df[columna].notna().sum())
+
+        if tipo == "mapear":
+            destino = regla.get("destino", columna)
+            df[destino] = serie.map(regla["mapa"])
+            rechazos = no_nulos - int(df[destino].notna().sum())
+            if regla.get("eliminar_origen") and destino != columna:
+                df.drop(columns=[columna], inplace=True)
+            return rechazos
+
+        if tipo == "recortar":
+            recortada = serie.clip(lower=regla.get("minimo"), upper=regla.get("maximo"))
+            rechazos = int(((recortada != serie) & serie.notna()).sum())
+            df[columna] = recortada
+            return rechazos
+
+        # convertir
+        if regla.get("redondeo") == "techo":
+            serie = np.ceil(pd.to_numeric(serie, errors="coerce"))
+        elif regla.get("redondeo") == "piso":
+            serie = np.floor(pd.to_numeric(serie, errors="coerce"))
+        df[columna] = serie.astype(regla["tipo"])
+        return no_nulos - int(df[columna].notna().sum())
+
+    def ejecutar(self, df, reglas):
+        """
+        Ejecuta las reglas sobre una copia del DataFrame.
+
+        Parámetros:
+        -----------
+        df : pd.DataFrame -> Datos de entrada.
+        reglas : list -> Reglas declarativas (ver REGLAS_LISTINGS y FILTROS_LISTINGS).
+
+        Retorna:
+        --------
+        pd.DataFrame -> Datos limpios. El detalle por regla queda en `ultimo_reporte`.
+        """
+        plan = self.compilar(reglas)
+        df = df.copy()
+        reporte = []
+
+        for columna, reglas_columna in plan["columnas"].items():
+            for regla in reglas_columna:
+                if columna not in df.columns:
+                    self.log.info(f"[RULES] - Columna '{columna}' no existe; se omite la regla '{regla['regla']}'.")
+                    continue
+                inicio = time.perf_counter()
+                try:
+                    rechazos = self._aplicar_columna(df, columna, regla)
+                except Exception as e:
+                    self.log.error(f"[RULES] - Error en la regla '{regla['regla']}' de '{columna}': {type(e).__name__} - {e}")
+                    continue
+                reporte.append({"columna": columna, "regla": regla["regla"], "ms": (time.perf_counter() - inicio) * 1000, "rechazos": rechazos})
+
+        if plan["filtros"]:
+            conservar = np.ones(len(df), dtype=bool)
+            for regla in plan["filtros"]:
+                columnas = [c for c in regla["columnas"] if c in df.columns]
+                if not columnas:
+                    continue
+                inicio = time.perf_counter()
+                mascara = self.motor.mascara_limites(
+                    df, columnas, regla["maximo"],
+                    inclusivo=regla.get("inclusivo", True),
+                    conservar_nulos=regla.get("conservar_nulos", True)
+                )
+                conservar &= mascara
+                reporte.append({"columna": ",".join(columnas), "regla": "filtrar", "ms": (time.perf_counter() - inicio) * 1000, "rechazos": int((~mascara).sum())})
+            # Una sola selección de filas para todos los filtros
+            df = df[conservar]
+
+        self.ultimo_reporte = pd.DataFrame(reporte, columns=["columna", "regla", "ms", "rechazos"])
+        for fila in reporte:
+            self.log.info(f"[RULES] - {fila['columna']}: {fila['regla']} en {fila['ms']:.1f} ms, rechazos: {fila['rechazos']}.")
+        return df
@@ -0,0 +1,160 @@
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from logs_bi import Logs
+from gold import Gold
+
+
+class Sabana:
+    """
+    Construye la sábana de datos consolidada: una fila por listing y mes con los
+    atributos del listing, la ocupación/precio de calendar y el sentimiento de reviews.
+
+    Para mantener la memoria acotada:
+    - calendar y reviews se pre-agregan por listing y mes antes de unir (Gold);
+    - listing_id se codifica como entero (posición en el conjunto ordenado de ids) y
+      calendar y reviews se unen sobre una clave entera (listing, año, mes);
+    - los atributos de listings se asignan por posición, sin merge sobre texto;
+    - el resultado se escribe particionado por año y mes en Parquet.
+    """
+
+    # Atributos de listings no numéricos que se conservan en la sábana
+    CATEGORICAS_LISTINGS = [
+        "room_type", "property_type", "neighbourhood_cleansed",
+        "host_response_category", "host_is_superhost", "instant_bookable",
+    ]
+
+    # Columnas de texto libre que no aportan a forecasting ni segmentación
+    EXCLUIR_LISTINGS = ["amenities", "amenities_list", "description", "name", "host_about", "listing_url", "picture_url"]
+
+    def __init__(self, data_dir=None, logs_dir=None):
+        """
+        Constructor de la clase Sabana.
+
+        Parámetros:
+        -----------
+        data_dir : str, opcional
+            Carpeta base de datos; la sábana se guarda en `data_dir/gold/sabana` (por defecto: ../data).
+        logs_dir : str, opcional
+            Carpeta de logs (por defecto: ../logs).
+        """
+        if data_dir is None:
+            data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+        self.output_dir = os.path.join(data_dir, "gold", "sabana")
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if logs_dir is None:
+            logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+        os.makedirs(logs_dir, exist_ok=True)
+        log_filename = f"logs_{timestamp}.txt"
+        self.log = Logs(os.path.join(logs_dir, log_filename))
+        self.gold = Gold(logs_dir=logs_dir)
+
+        self.log.info("[INIT] - Clase Sabana inicializada correctamente.")
+
+    def _atributos_listings(self, df_listings, columnas):
+        """Selecciona los atributos de listings y los ordena por listing_id."""
+        df = df_listings.rename(columns={"id": "listing_id"})
+        if columnas is None:
+            columnas = [
+                c for c in df.columns
+                if c != "listing_id" and c not in self.EXCLUIR_LISTINGS
+                and (pd.api.types.is_numeric_dtype(df[c]) or c in self.CATEGORICAS_LISTINGS)
+            ]
+        df = df[["listing_id"] + columnas].copy()
+        df["listing_id"] = df["listing_id"].astype(str)
+        df = df.drop_duplicates(subset=["listing_id"]).sort_values("listing_id", kind="stable")
+        return df.reset_index(drop=True)
+
+    def _codificar(self, ids, categorias):
+        """
+        Codifica listing_id como entero: posición en `categorias` (ordenadas y que contienen todos los ids).
+        La búsqueda binaria sobre claves ordenadas evita construir tablas hash sobre texto.
+        """
+        return np.searchsorted(categorias, ids.astype(str).to_numpy()).astype(np.int64)
+
+    def construir(self, df_listings, df_calendar, df_reviews, columnas_listings=None, guardar=True):
+        """
+        Construye la sábana listing x mes.
+
+        Parámetros:
+        -----------
+        df_listings : pd.DataFrame
+            Salida de Transformaciones.transformaciones_listings.
+        df_calendar : pd.DataFrame
+            Salida de Transformaciones.transformaciones_calendar.
+        df_reviews : pd.DataFrame
+            Salida de Transformaciones.transformaciones_reviews.
+        columnas_listings : list, opcional
+            Atributos de listings a incluir (por defecto: numéricos y categóricos de CATEGORICAS_LISTINGS).
+        guardar : bool, opcional
+            Si es True, escribe la sábana particionada por año y mes.
+
+        Retorna:
+        --------
+        pd.DataFrame -> Sábana con una fila por listing_id, year y month.
+        """
+        self.log.info("[SABANA] - Iniciando construcción de la sábana consolidada...")
+
+        # 1. Pre-agregación por listing y mes (reduce calendar de días a meses)
+        ocupacion = self.gold.construir_ocupacion_mensual(df_calendar)
+        sentimiento = self.gold.construir_sentimiento_mensual(df_reviews)
+
+        # 2. Codificación entera de listing_id: universo ordenado de ids de las tres fuentes
+        atributos = self._atributos_listings(df_listings, columnas_listings)
+        for df in (ocupacion, sentimiento):
+            df["listing_id"] = df["listing_id"].astype(str)
+        categorias = np.unique(np.concatenate([
+            atributos["listing_id"].to_numpy(), ocupacion["listing_id"].to_numpy(), sentimiento["listing_id"].to_numpy()
+        ]))
+        for df in (ocupacion, sentimiento):
+            # Clave compuesta entera (listing, año, mes)
+            df["clave"] = self._codificar(df["listing_id"], categorias) * 1_000_000 + df["year"] * 100 + df["month"]
+
+        # Fila de atributos por código de listing (-1 si el listing no está en la tabla de listings)
+        fila_atributos = np.full(len(categorias), -1, dtype=np.int64)
+        fila_atributos[self._codificar(atributos["listing_id"], categorias)] = np.arange(len(atributos))
+        self.log.info(
+            f"[SABANA] - listing_id codificado: {len(categorias)} ids, "
+            f"{int((fila_atributos < 0).sum())} sin atributos en listings."
+        )
+
+        # 3. Unión de calendar y reviews sobre la clave entera, ordenada por clave
+        sentimiento = sentimiento.drop(columns=["listing_id", "year", "month"])
+        sabana = pd.merge(ocupacion, sentimiento, on="clave", how="outer", sort=True)
+        sabana["codigo"] = sabana["clave"] // 1_000_000
+        sabana["year"] = (sabana["clave"] % 1_000_000) // 100
+        sabana["month"] = sabana["clave"] % 100
+        sabana["listing_id"] = categorias[sabana["codigo"].to_numpy()]
+        sabana = sabana.sort_values(["year", "month", "codigo"], kind="stable").reset_index(drop=True)
+
+        # 4. Atributos de listings asignados por posición (sin merge sobre texto)
+        filas = fila_atributos[sabana["codigo"].to_numpy()]
+        validos = filas >= 0
+        attrs = atributos.drop(columns=["listing_id"]).iloc[np.where(validos, filas, 0)].reset_index(drop=True)
+        if not validos.all():
+            attrs.loc[~validos] = np.nan
+        columnas_clave = ["listing_id", "year", "month"]
+        metricas = [c for c in sabana.columns if c not in columnas_clave + ["clave", "codigo"]]
+        sabana = pd.concat([sabana[columnas_clave + metricas], attrs], axis=1)
+
+        self.log.info(f"[SABANA] - Sábana construida: {len(sabana)} filas x {len(sabana.columns)} columnas.")
+
+        if guardar:
+            self.guardar(sabana)
+        return sabana
+
+    def guardar(self, sabana):
+        """Escribe la sábana en Parquet particionada por año y mes (year=YYYY/month=M)."""
+        try:
+            if os.path.exists(self.output_dir):
+                shutil.rmtree(self.output_dir)
+            for (year, month), particion in sabana.groupby(["year", "month"], sort=True):
+                ruta = os.path.join(self.output_dir, f"year={int(year)}", f"month={int(month)}")
+                os.makedirs(ruta, exist_ok=True)
+                particion.drop(columns=["year", "month"]).to_parquet(os.path.join(ruta, "part-0.parquet"), index=False)
+            self.log.info(f"[SABANA] - Sábana guardada particionada por año y mes en {self.output_dir}.")
+        except Exception as e:
+            self.log.error(f"[SABANA] - Error al guardar la sábana: {type(e).__name__} - {e}")
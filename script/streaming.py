@@ -0,0 +1,231 @@
+import os
+import queue
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from logs_bi import Logs
+
+
+# Marca de fin de flujo entre etapas
+_FIN = object()
+
+# Instancias de Transformaciones y DetectorIdioma por proceso de trabajo (ver _iniciar_trabajador)
+_TRANSF = None
+_DETECTOR = None
+
+
+def _iniciar_trabajador(motor="pandas", idiomas=False, logs_dir=None):
+    """
+    Crea las instancias del proceso de trabajo: Transformaciones con el motor indicado y,
+    si `idiomas`, un DetectorIdioma en serie (el proceso ya es parte de un pool).
+    """
+    global _TRANSF, _DETECTOR
+    from transformaciones import Transformaciones
+    _TRANSF = Transformaciones(motor=motor, logs_dir=logs_dir)
+    if idiomas:
+        from idiomas import DetectorIdioma
+        _DETECTOR = DetectorIdioma(procesos=1, logs_dir=logs_dir)
+
+
+def _transformar_lote(tipo, df):
+    """
+    Aplica la transformación fila a fila correspondiente a un lote.
+    Se define a nivel de módulo para ejecutarse en procesos de trabajo.
+    """
+    if _TRANSF is None:
+        _iniciar_trabajador()
+    if tipo == "calendar":
+        return _TRANSF.transformaciones_calendar(df)
+    if tipo == "reviews":
+        return _TRANSF.transformaciones_reviews(df, detector=_DETECTOR)
+    raise ValueError(f"Tipo '{tipo}' no soportado en modo streaming. Opciones: {PipelineStreaming.TIPOS}")
+
+
+class PipelineStreaming:
+    """
+    Ejecución en flujo Mongo -> Transformaciones -> SQL con colas acotadas.
+
+    - Un hilo productor lee lotes de MongoDB (Extracciones.extraer_lotes) y los deja en una cola.
+    - Los lotes se transforman en un pool de procesos iniciados con 'spawn' (trabajo de CPU en paralelo).
+    - Un hilo consumidor inserta cada lote transformado en SQL (DatabaseSQL.insert_chunk).
+
+    Extracción, cómputo y carga se solapan, y la memoria queda limitada por la
+    profundidad de las colas más los lotes en proceso.
+    Solo admite transformaciones locales a cada fila (calendar y reviews);
+    listings requiere la tabla completa (duplicados, top de amenities).
+    """
+
+    TIPOS = ("calendar", "reviews")
+
+    def __init__(self, extracciones, sql_instance, tam_lote=50000, profundidad_cola=4, workers=None, motor="pandas",
+                 idiomas=False, logs_dir=None):
+        """
+        Constructor de la clase PipelineStreaming.
+
+        Parámetros:
+        -----------
+        extracciones : Extracciones
+            Instancia de Extracciones con conexión a MongoDB.
+        sql_instance : DatabaseSQL
+            Instancia de conexión a SQL (se conecta y cierra en cada ejecución).
+        tam_lote : int, opcional
+            Documentos por lote.
+        profundidad_cola : int, opcional
+            Lotes máximos en espera en cada cola.
+        workers : int, opcional
+            Procesos de transformación (por defecto: núcleos disponibles).
+        motor : str, opcional
+            Motor de Transformaciones en los procesos de trabajo: 'pandas' o 'polars'.
+        idiomas : bool, opcional
+            Si es True, reviews se enruta por idioma (DetectorIdioma): solo el inglés pasa por VADER.
+        logs_dir : str, opcional
+            Carpeta de logs, también para los procesos de trabajo (por defecto: ../logs).
+        """
+        self.extr = extracciones
+        self.sql = sql_instance
+        self.tam_lote = tam_lote
+        self.profundidad_cola = profundidad_cola
+        self.workers = workers or os.cpu_count() or 1
+        self.motor = motor
+        self.idiomas = idiomas
+        self.logs_dir = logs_dir
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if logs_dir is None:
+            logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+        os.makedirs(logs_dir, exist_ok=True)
+        log_filename = f"logs_{timestamp}.txt"
+        self.log = Logs(os.path.join(logs_dir, log_filename))
+
+        self.log.info(
+            f"[INIT] - Clase PipelineStreaming inicializada (lote: {tam_lote}, cola: {profundidad_cola}, procesos: {self.workers}, motor: {motor}, idiomas: {idiomas})."
+        )
+
+    def _producir(self, db_name, collection_name, query, cola, errores):
+        """Hilo productor: extrae lotes de MongoDB y los encola."""
+        try:
+            for df in self.extr.extraer_lotes(db_name, collection_name, query, self.tam_lote):
+                cola.put(df)
+        except Exception as e:
+            errores.append(e)
+            self.log.error(f"[STREAM] - Error en la extracción de {db_name}.{collection_name}: {type(e).__name__} - {e}")
+        finally:
+            cola.put(_FIN)
+
+    def _consumir(self, table_name, schema, cola, resumen, errores):
+        """Hilo consumidor: inserta en SQL cada lote transformado."""
+        preparada = False
+        while True:
+            df = cola.get()
+            if df is _FIN:
+                break
+            # Tras un error se sigue vaciando la cola para no bloquear a las demás etapas
+            if errores:
+                continue
+            try:
+                if not preparada:
+                    # La tabla se crea (o se vacía) con la estructura del primer lote
+                    if not self.sql.prepare_table(df, table_name, schema):
+                        raise Exception(f"No se pudo preparar la tabla '{schema}.{table_name}'.")
+                    preparada = True
+                insertadas = self.sql.insert_chunk(df, table_name, schema)
+                if insertadas != len(df):
+                    raise Exception(f"Falló la inserción de un bloque en '{schema}.{table_name}'.")
+                resumen["filas"] += insertadas
+                resumen["lotes"] += 1
+            except Exception as e:
+                errores.append(e)
+                self.log.error(f"[STREAM] - Error en la carga de {schema}.{table_name}: {type(e).__name__} - {e}")
+
+    def ejecutar(self, db_name, collection_name, tipo, table_name, schema="dbo", query=None):
+        """
+        Ejecuta el flujo completo para una colección.
+
+        Parámetros:
+        -----------
+        db_name : str
+            Base de datos de MongoDB.
+        collection_name : str
+            Colección de origen.
+        tipo : str
+            Transformación a aplicar: 'calendar' o 'reviews'.
+        table_name : str
+            Tabla SQL destino (se sobrescribe).
+        schema : str, opcional
+            Esquema SQL.
+        query : dict, opcional
+            Filtro MongoDB aplicado en la extracción.
+
+        Retorna:
+        --------
+        dict -> Lotes y filas cargadas, y si la ejecución terminó sin errores.
+        """
+        if tipo not in self.TIPOS:
+            raise ValueError(f"Tipo '{tipo}' no soportado en modo streaming. Opciones: {self.TIPOS}")
+
+        inicio = datetime.now()
+        self.log.info(f"[STREAM] - Iniciando flujo {db_name}.{collection_name} -> {schema}.{table_name} ({tipo}).")
+
+        cola_extraidos = queue.Queue(maxsize=self.profundidad_cola)
+        cola_transformados = queue.Queue(maxsize=self.profundidad_cola)
+        errores = []
+        resumen = {"lotes": 0, "filas": 0}
+
+        self.sql.connect()
+        productor = threading.Thread(
+            target=self._producir, args=(db_name, collection_name, query, cola_extraidos, errores), daemon=True
+        )
+        consumidor = threading.Thread(
+            target=self._consumir, args=(table_name, schema, cola_transformados, resumen, errores), daemon=True
+        )
+        productor.start()
+        consumidor.start()
+
+        try:
+            # 'spawn': el pool se crea con los hilos productor/consumidor y los de pymongo ya
+            # activos; un fork de un proceso con hilos puede bloquear a los procesos hijos
+            with ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_iniciar_trabajador, initargs=(self.motor, self.idiomas, self.logs_dir)
+            ) as executor:
+                en_proceso = deque()
+                while True:
+                    df = cola_extraidos.get()
+                    if df is _FIN:
+                        break
+                    en_proceso.append(executor.submit(_transformar_lote, tipo, df))
+                    # Limitar los lotes en proceso; se entregan en orden de llegada
+                    if len(en_proceso) >= self.workers:
+                        cola_transformados.put(en_proceso.popleft().result())
+                while en_proceso:
+                    cola_transformados.put(en_proceso.popleft().result())
+        except Exception as e:
+            errores.append(e)
+            self.log.error(f"[STREAM] - Error en la transformación de '{collection_name}': {type(e).__name__} - {e}")
+            # Vaciar la cola de extracción para liberar al productor
+            while productor.is_alive() or not cola_extraidos.empty():
+                try:
+                    if cola_extraidos.get(timeout=1) is _FIN:
+                        break
+                except queue.Empty:
+                    pass
+        finally:
+            cola_transformados.put(_FIN)
+            productor.join()
+            consumidor.join()
+            if not errores:
+                self.sql.compactar_columnstore(table_name, schema)
+            self.sql.close()
+
+        segundos = (datetime.now() - inicio).total_seconds()
+        resumen["exito"] = not errores
+        if errores:
+            self.log.error(f"[STREAM] - Flujo {collection_name} terminado con errores tras {resumen['lotes']} lotes ({resumen['filas']} filas).")
+            print(f"Error en el flujo streaming de '{collection_name}'. Ver logs para más detalles.")
+        else:
+            self.log.info(
+                f"[STREAM] - Flujo {collection_name} completado: {resumen['lotes']} lotes, {resumen['filas']} filas en {segundos:.1f} s."
+            )
+        return resumen
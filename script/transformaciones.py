@@ -1,33 +1,92 @@
 import os
+import sys
+import hashlib
+import inspect
 import pandas as pd
 from datetime import datetime
 from logs_bi import Logs
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
 import ast
+import threading
 import unicodedata
 import numpy as np
-import nltk
 from collections import Counter
+from motores import crear_motor
+from reglas import MotorReglas, REGLAS_LISTINGS, FILTROS_LISTINGS
+from calendario_compacto import CalendarioCompacto
+from idiomas import DetectorIdioma, IDIOMA_INDEFINIDO
+
+
+# ===========================================================
+# Analizador VADER compartido
+# nltk y el lexicón se cargan una sola vez por proceso, en el primer uso.
+# ===========================================================
+_SIA = None
+_SIA_LOCK = threading.Lock()
+
+
+def _lexicon_disponible():
+    """Verifica si el lexicón de VADER está instalado sin construir el analizador."""
+    import nltk
+    try:
+        nltk.data.find("sentiment/vader_lexicon.zip")
+        return True
+    except LookupError:
+        return False
+
+
+def obtener_analizador():
+    """
+    Retorna el SentimentIntensityAnalyzer compartido del proceso.
+    En la primera llamada importa nltk, descarga el lexicón si falta y construye el analizador.
+    """
+    global _SIA
+    if _SIA is None:
+        with _SIA_LOCK:
+            if _SIA is None:
+                import nltk
+                from nltk.sentiment.vader import SentimentIntensityAnalyzer
+                if not _lexicon_disponible():
+                    nltk.download("vader_lexicon", quiet=True)
+                _SIA = SentimentIntensityAnalyzer()
+    return _SIA
 
 
 class Transformaciones:
-    def __init__(self):
+    def __init__(self, motor="pandas", logs_dir=None):
         """
         Inicializa la clase de transformaciones con un sistema de logs.
+
+        Parámetros:
+        -----------
+        motor : str, opcional
+            Motor para las operaciones columnares: 'pandas' (referencia) o 'polars'.
+        logs_dir : str, opcional
+            Carpeta de logs (por defecto: ../logs).
         """
         # Crear log con fecha y hora
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+        if logs_dir is None:
+            logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
         os.makedirs(logs_dir, exist_ok=True)
         log_filename = f"logs_{timestamp}.txt"
         self.log = Logs(os.path.join(logs_dir, log_filename))
-        
-        try:
-            SentimentIntensityAnalyzer()
-        except LookupError:
-            nltk.download('vader_lexicon')
 
-        self.log.info("[INIT] - Clase Transformaciones inicializada correctamente.")
+        self.motor = crear_motor(motor)
+        self.reglas = MotorReglas(self.motor, self.log)
+
+        self.log.info(f"[INIT] - Clase Transformaciones inicializada correctamente (motor: {self.motor.nombre}).")
+
+    def version_cache(self):
+        """
+        Versión de las dependencias de las etapas, usada por CacheEtapas en la clave:
+        motor elegido, reglas declaradas y código de este módulo, de reglas, de motores y de idiomas.
+        """
+        h = hashlib.sha256()
+        h.update(self.motor.nombre.encode("utf-8"))
+        h.update(repr((REGLAS_LISTINGS, FILTROS_LISTINGS)).encode("utf-8"))
+        for nombre in (__name__, MotorReglas.__module__, crear_motor.__module__, DetectorIdioma.__module__):
+            h.update(inspect.getsource(sys.modules[nombre]).encode("utf-8"))
+        return h.hexdigest()
 
     def transformaciones_listings(self, df):
         """
@@ -50,44 +109,13 @@ class Transformaciones:
         )
 
         # ==========================================================
-        # Limpieza de columnas de tasa ('%')
+        # Limpieza declarativa de columnas (tasas, categorías, precio, baños)
         # ==========================================================
-        cols_rate = ['host_acceptance_rate', 'host_response_rate']
-        for col in cols_rate:
-            if col in df_transformado.columns:
-                try:
-                    df_transformado[col] = (
-                        df_transformado[col]
-                        .astype(str)
-                        .str.replace('%', '', regex=False)
-                        .astype(float)
-                    )
-                    self.log.info(
-                        f"[CLEAN] - Columna '{col}' transformada: "
-                        f"se eliminaron '%' y se convirtió a numérico. "
-                        f"Valores ejemplo: {df_transformado[col].dropna().head(5).tolist()}"
-                    )
-                except Exception as e:
-                    self.log.error(f"[CLEAN] - Error al limpiar columna '{col}': {type(e).__name__} - {e}")
-
-        # ==========================================================
-        # Categorización de host_response_time
-        # ==========================================================
-        response_time_map = {
-            'within an hour': 'Fast',
-            'within a few hours': 'Fast',
-            'within a day': 'Moderate',
-            'a few days or more': 'Slow'
-        }
-
-        if 'host_response_time' in df_transformado.columns:
-            df_transformado['host_response_category'] = df_transformado['host_response_time'].map(response_time_map)
-            df_transformado = df_transformado.drop(columns=['host_response_time'])
-            self.log.info(
-                "[TRANSFORM] - 'host_response_time' categorizado en 'host_response_category'. "
-                "Se simplificó a categorías Fast, Moderate, Slow. "
-                f"Valores únicos finales: {df_transformado['host_response_category'].unique().tolist()}"
-            )
+        df_transformado = self.reglas.ejecutar(df_transformado, REGLAS_LISTINGS)
+        self.log.info(
+            "[CLEAN] - Reglas de limpieza aplicadas: "
+            f"{self.reglas.ultimo_reporte[['columna', 'regla', 'rechazos']].to_dict(orient='records')}"
+        )
 
         # ==========================================================
         # Columnas binarias en 'host_verifications'
@@ -111,23 +139,6 @@ class Transformaciones:
                 f"Primeros registros transformados: \n{df_verifications.head(3)}"
             )
 
-        # ==========================================================
-        # Limpieza de columna 'price'
-        # ==========================================================
-        if 'price' in df_transformado.columns:
-            df_transformado['price'] = (
-                df_transformado['price']
-                    .astype(str)
-                    .str.replace('$', '', regex=False)
-                    .str.replace(',', '', regex=False)
-                    .str.replace('.', '', regex=False)
-                    .astype(float)
-            )
-            self.log.info(
-                "[CLEAN] - Columna 'price' limpiada: símbolos eliminados y convertida a numérico. "
-                f"Valores ejemplo: {df_transformado['price'].head(5).tolist()}"
-            )
-
         # ==========================================================
         # Limpieza de neighbourhood
         # ==========================================================
@@ -145,16 +156,6 @@ class Transformaciones:
                 f"Valores ejemplo: {df_transformado['neighbourhood'].dropna().unique()[:5]}"
             )
 
-        # ==========================================================
-        # Normalización columna bathrooms
-        # ==========================================================
-        if 'bathrooms' in df_transformado.columns:
-            df_transformado['bathrooms'] = np.ceil(df_transformado['bathrooms']).astype('Int64')
-            self.log.info(
-                "[TRANSFORM] - 'bathrooms' redondeada hacia arriba y convertida a Int64. "
-                f"Valores ejemplo: {df_transformado['bathrooms'].head(5).tolist()}"
-            )
-
         # ==========================================================
         # Eliminación de columnas irrelevantes
         # ==========================================================
@@ -169,11 +170,8 @@ class Transformaciones:
         # ==========================================================
         # Eliminación de outliers
         # ==========================================================
-        cols_outliers = ['bathrooms', 'bedrooms', 'beds']
         n_reg_before = len(df_transformado)
-        filtro = (df_transformado[cols_outliers] > 15).any(axis=1)
-        df_transformado = df_transformado[~filtro].copy()
-        df_transformado = df_transformado[df_transformado['price'] < 400000000]
+        df_transformado = self.reglas.ejecutar(df_transformado, FILTROS_LISTINGS)
         n_reg_after = len(df_transformado)
         self.log.info(
             "[OUTLIERS] - Eliminación de valores extremos en 'bathrooms', 'bedrooms', 'beds' y 'price'. "
@@ -227,11 +225,11 @@ class Transformaciones:
         # Desagregación de fechas
         # ==========================================================
         # Convertir a datetime de forma segura antes de desagregar
-        df_transformado['date'] = pd.to_datetime(df_transformado['date'], errors='coerce')
+        df_transformado['date'] = self.motor.convertir_fecha(df_transformado, 'date')
 
-        df_transformado['year'] = df_transformado['date'].dt.year
-        df_transformado['month'] = df_transformado['date'].dt.month
-        df_transformado['day'] = df_transformado['date'].dt.day
+        df_transformado[['year', 'month', 'day']] = self.motor.componentes_fecha(
+            df_transformado, 'date', {'year': 'year', 'month': 'month', 'day': 'day'}
+        )
         self.log.info(
             "[TRANSFORM] - Columna 'date' desagregada correctamente en componentes 'year', 'month' y 'day'"
             f"Ejemplo de valores: {df_transformado[['date', 'year', 'month', 'day']].head(3).to_dict(orient='records')}"
@@ -250,10 +248,51 @@ class Transformaciones:
         # ==========================================================
         self.log.info(f"[END] - Transformaciones completadas. Total final de registros: {len(df_transformado)}.Total columnas: {len(df_transformado.columns)}.")
         return df_transformado
+
+
+    def calendar_compacto(self, df, fecha_inicio=None, fecha_fin=None):
+        """
+        Convierte calendar (formato largo) a su forma compacta: bitsets de disponibilidad
+        por listing y día y un arreglo de precios (ver CalendarioCompacto).
+
+        Parámetros:
+        -----------
+        df : pd.DataFrame -> Calendar original o transformado ('listing_id', 'date', 'available', 'price').
+        fecha_inicio, fecha_fin : str, opcional -> Rango de días a representar.
+
+        Retorna:
+        --------
+        CalendarioCompacto
+        """
+        compacto = CalendarioCompacto.desde_largo(df, fecha_inicio, fecha_fin)
+        self.log.info(
+            f"[TRANSFORM] - Calendar compactado: {len(compacto.listing_ids)} listings x {compacto.dias} días "
+            f"en {compacto.memoria_bytes / 1024 ** 2:.1f} MB (formato largo: "
+            f"{df.memory_usage(deep=True).sum() / 1024 ** 2:.1f} MB)."
+        )
+        return compacto
     
-    def transformaciones_reviews(self, df):
+    def _puntuar_vader(self, comentarios):
+        """Puntuación compuesta de VADER para una serie de comentarios."""
+        sia = obtener_analizador()
+        return comentarios.apply(lambda x: sia.polarity_scores(x)['compound'])
+
+    def transformaciones_reviews(self, df, detector=None, puntuadores=None):
         """
         Aplica análisis de sentimiento y prepara los datos de reviews para la tabla de hechos.
+
+        Parámetros:
+        -----------
+        df : pd.DataFrame
+            Reviews crudas.
+        detector : DetectorIdioma, opcional
+            Si se indica, se agrega la columna 'language' y cada comentario se puntúa
+            solo con el puntuador de su idioma. Sin detector, todo se puntúa con VADER.
+        puntuadores : dict, opcional
+            Idioma -> función que recibe una pd.Series de comentarios y retorna la puntuación
+            compuesta en [-1, 1] (ej. {'es': puntuador_es}). VADER se usa solo para 'en'. Los
+            comentarios cortos o sin idioma reconocible ('und') usan el puntuador de 'es' si existe.
+            Los idiomas sin puntuador quedan como 'No_Evaluado'.
         """
         self.log.info("[START] - Iniciando proceso de transformaciones para 'reviews'.")
         df_transformado = df.copy()
@@ -266,31 +305,43 @@ class Transformaciones:
         df_transformado['comments'] = df_transformado['comments'].fillna('')
         self.log.info(f"[CLEAN] - Nulos en 'comments' rellenados con cadena vacía. Total registros: {len(df_transformado)}.")
         
-        # 2. Análisis de Sentimiento con VADER
-        sia = SentimentIntensityAnalyzer()
-
-        def get_sentiment(text):
-            score = sia.polarity_scores(text)
-            comp = score['compound']
-            if comp >= 0.05:
-                return 'Positivo'
-            elif comp <= -0.05:
-                return 'Negativo'
-            else:
-                return 'Neutral', comp
-
-        # Aplicar el análisis de sentimiento y obtener la puntuación compuesta
-        df_transformado['Sentimiento'] = df_transformado['comments'].apply(
-            lambda x: 'Positivo' if sia.polarity_scores(x)['compound'] >= 0.05 else 
-                      ('Negativo' if sia.polarity_scores(x)['compound'] <= -0.05 else 'Neutral')
-        )
-        df_transformado['Puntuacion_Compuesta'] = df_transformado['comments'].apply(
-            lambda x: sia.polarity_scores(x)['compound']
+        # 2. Análisis de Sentimiento
+        if detector is None:
+            # Calcular la puntuación compuesta de VADER una sola vez por comentario
+            df_transformado['Puntuacion_Compuesta'] = self._puntuar_vader(df_transformado['comments'])
+            self.log.info("[TRANSFORM] - Análisis de Sentimiento (VADER) completado.")
+        else:
+            # Detectar idioma y enrutar cada comentario al puntuador de su idioma
+            df_transformado['language'] = detector.detectar(df_transformado['comments'])
+            rutas = {'en': self._puntuar_vader}
+            rutas.update(puntuadores or {})
+            # VADER solo entiende inglés: los comentarios sin idioma reconocible (en su mayoría
+            # cortos y en español) van al puntuador de 'es'; sin él quedan como 'No_Evaluado'
+            if 'es' in rutas:
+                rutas.setdefault(IDIOMA_INDEFINIDO, rutas['es'])
+
+            df_transformado['Puntuacion_Compuesta'] = np.nan
+            for idioma, puntuador in rutas.items():
+                mascara = df_transformado['language'] == idioma
+                if mascara.any():
+                    df_transformado.loc[mascara, 'Puntuacion_Compuesta'] = puntuador(df_transformado.loc[mascara, 'comments']).values
+                    self.log.info(f"[TRANSFORM] - Sentimiento calculado para {int(mascara.sum())} comentarios en '{idioma}'.")
+
+            sin_puntuar = int(df_transformado['Puntuacion_Compuesta'].isna().sum())
+            self.log.info(f"[TRANSFORM] - Comentarios sin puntuador para su idioma: {sin_puntuar}.")
+
+        df_transformado['Sentimiento'] = np.select(
+            [
+                df_transformado['Puntuacion_Compuesta'].isna(),
+                df_transformado['Puntuacion_Compuesta'] >= 0.05,
+                df_transformado['Puntuacion_Compuesta'] <= -0.05
+            ],
+            ['No_Evaluado', 'Positivo', 'Negativo'],
+            default='Neutral'
         )
-        self.log.info("[TRANSFORM] - Análisis de Sentimiento (VADER) completado.")
         
         # 3. Desagregación de Fechas (Requisito para BI)
-        df_transformado['date'] = pd.to_datetime(df_transformado['date'], errors='coerce')
+        df_transformado['date'] = self.motor.convertir_fecha(df_transformado, 'date')
         
         # Eliminar filas con fechas no válidas si las hay (aunque no es común en reviews)
         registros_antes = len(df_transformado)
@@ -300,8 +351,9 @@ class Transformaciones:
         if registros_antes != registros_despues:
              self.log.info(f"[CLEAN] - Se eliminaron {registros_antes - registros_despues} registros con fecha nula después de la conversión.")
         
-        df_transformado['review_year'] = df_transformado['date'].dt.year
-        df_transformado['review_month'] = df_transformado['date'].dt.month
+        df_transformado[['review_year', 'review_month']] = self.motor.componentes_fecha(
+            df_transformado, 'date', {'review_year': 'year', 'review_month': 'month'}
+        )
         
         self.log.info("[TRANSFORM] - Fechas desagregadas en 'review_year' y 'review_month'.")
 
@@ -312,6 +364,8 @@ class Transformaciones:
         final_cols = ['id', 'listing_id', 'reviewer_id', 'date', 
                       'review_year', 'review_month', 
                       'Sentimiento', 'Puntuacion_Compuesta']
+        if 'language' in df_transformado.columns:
+            final_cols.append('language')
         
         df_transformado = df_transformado[final_cols].copy()
         
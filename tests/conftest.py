@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los módulos del ETL viven en script/ y se importan por nombre (ej. `from motores import ...`)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "script"))
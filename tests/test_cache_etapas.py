@@ -0,0 +1,40 @@
+import os
+
+import pandas as pd
+
+import cache_etapas
+from cache_etapas import CacheEtapas
+
+
+def test_evict_ignora_archivos_eliminados_por_otra_ejecucion(tmp_path, monkeypatch):
+    cache = CacheEtapas(cache_dir=str(tmp_path / "cache"), max_bytes=0, logs_dir=str(tmp_path / "logs"))
+    pd.DataFrame({"a": [1]}).to_parquet(os.path.join(cache.cache_dir, "etapa_1.parquet"))
+
+    listdir = os.listdir
+    # Simula otra ciudad que borra un archivo entre listdir y stat
+    monkeypatch.setattr(cache_etapas.os, "listdir", lambda ruta: listdir(ruta) + ["etapa_borrada.parquet"])
+    cache._evict()
+    assert listdir(cache.cache_dir) == []
+
+
+def test_logs_en_carpeta_indicada(tmp_path):
+    CacheEtapas(cache_dir=str(tmp_path / "cache"), logs_dir=str(tmp_path / "logs"))
+    assert os.listdir(tmp_path / "logs")
+
+
+def _puntuador_es(comentarios):
+    return comentarios.str.len() * 0.0
+
+
+class _SinRepr:
+    pass
+
+
+def test_clave_estable_con_puntuadores(tmp_path):
+    cache = CacheEtapas(cache_dir=str(tmp_path / "cache"), logs_dir=str(tmp_path / "logs"))
+    df = pd.DataFrame({"a": [1, 2]})
+    clave = cache.clave(_puntuador_es, df, puntuadores={"es": _puntuador_es}, otro=_SinRepr())
+    # Ni la dirección de memoria de la función ni la de un objeto sin __repr__ forman parte de la clave
+    assert "0x" not in cache_etapas.identidad_parametro(_puntuador_es)
+    assert cache_etapas.identidad_parametro(_SinRepr()) == cache_etapas.identidad_parametro(_SinRepr())
+    assert clave == cache.clave(_puntuador_es, df, puntuadores={"es": _puntuador_es}, otro=_SinRepr())
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from calendario_compacto import CalendarioCompacto
+
+
+def _calendar():
+    return pd.DataFrame({
+        "listing_id": [1, 1, 2, 2],
+        "date": ["2025-06-25", "2025-06-26", "2025-06-25", "2025-06-27"],
+        "available": ["t", "f", "f", "t"],
+        "price": ["$100.00", "$200.00", None, "$1,000.00"],
+    })
+
+
+def test_ocupacion_y_precio_en_rango():
+    cal = CalendarioCompacto.desde_largo(_calendar())
+    ocupacion = cal.ocupacion("2025-06-25", "2025-06-27")
+    assert ocupacion["noches_totales"].tolist() == [2, 2]
+    assert ocupacion["noches_ocupadas"].tolist() == [1, 1]
+    assert cal.precio_promedio("2025-06-25", "2025-06-27").tolist() == [150.0, 1000.0]
+
+
+@pytest.mark.parametrize("fecha_ini, fecha_fin", [
+    ("2025-01-01", "2025-01-31"),  # antes del calendario
+    ("2025-07-01", "2025-07-31"),  # después del calendario
+    ("2025-06-27", "2025-06-25"),  # rango invertido
+])
+def test_rango_fuera_del_calendario(fecha_ini, fecha_fin):
+    cal = CalendarioCompacto.desde_largo(_calendar())
+    assert cal.precio_promedio(fecha_ini, fecha_fin).isna().all()
+    assert cal.noches_disponibles(fecha_ini, fecha_fin).tolist() == [0, 0]
+
+
+@pytest.mark.parametrize("df", [
+    _calendar().iloc[0:0],
+    _calendar().assign(date=["abc", None, "", "31/12/2025"]),
+])
+def test_calendario_sin_fechas_validas(df):
+    cal = CalendarioCompacto.desde_largo(df)
+    assert cal.dias == 0
+    assert len(cal.listing_ids) == 0
+    assert len(cal.a_largo()) == 0
+    assert cal.precio_promedio("2025-06-25", "2025-06-27").empty
+    assert cal.ocupacion("2025-06-25", "2025-06-27").empty
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from gold import Gold
+
+
+class _SQLFalso:
+    def __init__(self):
+        self.reemplazos = []
+
+    def connect(self):
+        pass
+
+    def close(self):
+        pass
+
+    def replace_partitions(self, df, table_name, partition_cols, schema="dbo"):
+        self.reemplazos.append((partition_cols, df[["year", "month"]].drop_duplicates().values.tolist()))
+
+
+def _gold():
+    return pd.DataFrame({"listing_id": [1, 2, 1], "year": [2025, 2025, 2025], "month": [5, 6, 7], "noches": [3, 4, 5]})
+
+
+def test_meses_completos_se_reemplazan_enteros(tmp_path):
+    sql = _SQLFalso()
+    Gold(logs_dir=str(tmp_path)).cargar_incremental(_gold(), "gold_ocupacion_mensual", "dbo", sql, "2025-05-15", "2025-06-30")
+    assert sql.reemplazos == [(["year", "month"], [[2025, 6]])]
+
+
+def test_sin_ventana_reemplaza_particiones_listing_mes(tmp_path):
+    sql = _SQLFalso()
+    Gold(logs_dir=str(tmp_path)).cargar_incremental(_gold(), "gold_ocupacion_mensual", "dbo", sql)
+    assert sql.reemplazos[0][0] == ["listing_id", "year", "month"]
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+import transformaciones
+from transformaciones import Transformaciones
+
+
+class _DetectorFijo:
+    """Detector que retorna los idiomas indicados, en orden."""
+
+    def __init__(self, idiomas):
+        self.idiomas = idiomas
+
+    def detectar(self, comentarios):
+        return pd.Series(self.idiomas, index=comentarios.index, dtype=object)
+
+
+class _VaderFalso:
+    def polarity_scores(self, texto):
+        return {"compound": 0.9}
+
+
+@pytest.fixture
+def transf(tmp_path, monkeypatch):
+    monkeypatch.setattr(transformaciones, "_SIA", _VaderFalso())
+    return Transformaciones(logs_dir=str(tmp_path))
+
+
+def _reviews():
+    return pd.DataFrame({
+        "id": [1, 2, 3],
+        "listing_id": [10, 10, 11],
+        "date": ["2025-06-26", "2025-06-27", "2025-06-28"],
+        "reviewer_id": [100, 101, 102],
+        "comments": ["Great stay, would come back", "Muy bien", "Excelente ubicación y anfitrión"],
+    })
+
+
+def test_und_usa_puntuador_es(transf):
+    detector = _DetectorFijo(["en", "und", "es"])
+    puntuador_es = lambda comentarios: pd.Series(-0.5, index=comentarios.index)
+    df = transf.transformaciones_reviews(_reviews(), detector=detector, puntuadores={"es": puntuador_es})
+    assert df["Puntuacion_Compuesta"].tolist() == [0.9, -0.5, -0.5]
+    assert df["Sentimiento"].tolist() == ["Positivo", "Negativo", "Negativo"]
+
+
+def test_und_sin_puntuador_es_queda_sin_evaluar(transf):
+    detector = _DetectorFijo(["en", "und", "es"])
+    df = transf.transformaciones_reviews(_reviews(), detector=detector)
+    assert df["Sentimiento"].tolist() == ["Positivo", "No_Evaluado", "No_Evaluado"]
+
+
+def test_detector_logs_en_carpeta_indicada(tmp_path):
+    from idiomas import DetectorIdioma
+    DetectorIdioma(cache_path=str(tmp_path / "idiomas.parquet"), logs_dir=str(tmp_path / "logs"))
+    assert len(list((tmp_path / "logs").iterdir())) == 1
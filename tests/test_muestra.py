@@ -0,0 +1,14 @@
+import os
+
+from main import CIUDAD_POR_DEFECTO, PREFIJO_MUESTRA, aislar_muestra
+
+
+def test_muestra_usa_salidas_separadas(tmp_path):
+    ciudad = {**CIUDAD_POR_DEFECTO, "data_dir": str(tmp_path), "prefijo_tablas": "mx_", "muestra": 0.01}
+    aislada = aislar_muestra(ciudad)
+    assert aislada["data_dir"] == os.path.join(str(tmp_path), "muestra")
+    assert aislada["prefijo_tablas"] == f"{PREFIJO_MUESTRA}mx_"
+
+
+def test_sin_muestra_no_cambia_la_configuracion():
+    assert aislar_muestra(dict(CIUDAD_POR_DEFECTO)) == CIUDAD_POR_DEFECTO
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from multiciudad import EjecucionMultiCiudad
+
+
+def _ejecucion(ciudades, tmp_path):
+    ejecucion = EjecucionMultiCiudad(ciudades)
+    ejecucion.base_dir = str(tmp_path)
+    return ejecucion
+
+
+def test_prefijo_por_defecto_separa_ciudades(tmp_path):
+    ejecucion = _ejecucion([], tmp_path)
+    mx = ejecucion._configurar({"nombre": "mx", "db_mongo": "bi_mx"})
+    bue = ejecucion._configurar({"nombre": "bue", "db_mongo": "bi_bue", "schema": "bue"})
+    assert mx["prefijo_tablas"] == "mx_"
+    assert "prefijo_tablas" not in bue
+    ejecucion._validar_destinos([mx, bue])
+
+
+def test_rechaza_ciudades_con_las_mismas_tablas(tmp_path):
+    ejecucion = _ejecucion([], tmp_path)
+    configs = [
+        ejecucion._configurar({"nombre": "mx", "db_mongo": "bi_mx", "prefijo_tablas": ""}),
+        ejecucion._configurar({"nombre": "gdl", "db_mongo": "bi_gdl", "schema": "dbo"}),
+    ]
+    with pytest.raises(ValueError):
+        ejecucion._validar_destinos(configs)
+
+
+def test_etapas_en_pool_de_procesos(tmp_path):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    import pandas as pd
+
+    from cache_etapas import CacheEtapas
+    from idiomas import DetectorIdioma
+    from main import ejecutor_en_pool
+    from transformaciones import Transformaciones
+
+    pytest.importorskip("langdetect")
+    calendar = pd.DataFrame({
+        "listing_id": [1, 2], "date": ["2025-06-26", "abc"], "available": ["t", "f"],
+        "price": ["$10.00", None], "minimum_nights": [1, 1], "maximum_nights": [30, 30],
+    })
+    reviews = pd.DataFrame({
+        "id": [1], "listing_id": [1], "date": ["2025-06-26"], "reviewer_id": [5],
+        "comments": ["El departamento estaba muy limpio y la ubicación es excelente"],
+    })
+    logs_dir = str(tmp_path / "logs")
+    transf = Transformaciones(logs_dir=logs_dir)
+    cache = CacheEtapas(cache_dir=str(tmp_path / "cache"), logs_dir=logs_dir)
+    detector = DetectorIdioma(procesos=1, cache_path=str(tmp_path / "idiomas.parquet"), logs_dir=logs_dir)
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        ejecutor = ejecutor_en_pool(pool, "pandas", logs_dir)
+        df_calendar = cache.ejecutar(transf.transformaciones_calendar, calendar, ejecutor=ejecutor)
+        df_reviews = cache.ejecutar(transf.transformaciones_reviews, reviews, ejecutor=ejecutor, detector=detector)
+
+    pd.testing.assert_frame_equal(df_calendar, transf.transformaciones_calendar(calendar))
+    assert df_reviews["Sentimiento"].tolist() == ["No_Evaluado"]
+    # El ejecutor no forma parte de la clave: sin pool se reutiliza el resultado en caché
+    clave = cache.clave(transf.transformaciones_calendar, calendar)
+    assert os.path.exists(cache._ruta("transformaciones_calendar", clave))
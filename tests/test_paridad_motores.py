@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("polars")
+
+import transformaciones
+from motores import MotorPandas, MotorPolars
+from transformaciones import Transformaciones
+
+
+# Fechas con formatos mixtos, nulas e inválidas: solo PATRON_FECHA se acepta en ambos motores
+FECHAS = [
+    "2025-06-26", "2025-06-26 10:00:00", "2025-06-26T10:00:00", " 2025-06-27 ",
+    "2025-06-26 10:00:00.250", "26/06/2025", "20250626", "2025-6-26", "2025-02-30",
+    "2025-06-26 25:00:00", "2025-06-26T10:00:00Z", "", "abc", None,
+]
+
+
+class _VaderFalso:
+    """Sustituto determinista de SentimentIntensityAnalyzer (sin descargar el léxico)."""
+
+    def polarity_scores(self, texto):
+        return {"compound": {"great": 0.8, "bad": -0.6}.get(texto.split(" ")[0].lower(), 0.0)}
+
+
+@pytest.fixture
+def transf(tmp_path, monkeypatch):
+    monkeypatch.setattr(transformaciones, "_SIA", _VaderFalso())
+    return {motor: Transformaciones(motor=motor, logs_dir=str(tmp_path)) for motor in ("pandas", "polars")}
+
+
+def _listings():
+    return pd.DataFrame({
+        "id": np.arange(8),
+        "host_acceptance_rate": ["100%", "95%", None, "abc%", "", "80%", "N/A", "50%"],
+        "host_response_rate": ["100%", None, "90%", "90", "%", "70%", "100%", None],
+        "host_response_time": ["within an hour", "within a day", None, "a few days or more",
+                               "unknown", "within a few hours", "within an hour", None],
+        "host_verifications": ["['email', 'phone']", "['phone']", "[]", None,
+                               "['email']", "['phone']", "[]", "['email', 'phone']"],
+        "price": ["$1,234.50", "$85.00", None, "$-", "abc", "$4,000,000.00", "$3,999,999.99", "$0.00"],
+        "neighbourhood": ["Cuauhtémoc", "Coyoacán", None, "Roma", "Cuauhtémoc", None, "Roma", "Coyoacán"],
+        "bathrooms": [1.0, 1.5, np.nan, 20.0, 2.0, 1.0, 15.0, 3.2],
+        "bedrooms": [1.0, 2.0, np.nan, 3.0, 16.0, 1.0, 2.0, np.nan],
+        "beds": [1.0, 2.0, 16.0, np.nan, 1.0, 2.0, 3.0, 1.0],
+        "amenities": ["Wifi, Kitchen", "Wifi, TV, Washer", None, "Kitchen", "", "Wifi", "TV", "Kitchen"],
+    })
+
+
+def _calendar():
+    n = len(FECHAS)
+    return pd.DataFrame({
+        "listing_id": np.arange(n) % 3,
+        "date": FECHAS,
+        "available": ["t", "f"] * (n // 2),
+        "price": ["$1,200.00", None, "$850.00", "abc"] * (n // 4) + ["$10.00"] * (n % 4),
+        "minimum_nights": np.ones(n, dtype=int),
+        "maximum_nights": np.full(n, 365),
+    })
+
+
+def _reviews():
+    n = len(FECHAS)
+    comentarios = ["Great place", "bad host", None, "ok", ""] * n
+    return pd.DataFrame({
+        "id": np.arange(n),
+        "listing_id": np.arange(n) % 4,
+        "date": FECHAS,
+        "reviewer_id": np.arange(n) * 10,
+        "comments": comentarios[:n],
+    })
+
+
+@pytest.mark.parametrize("dtype", [object, "str"])
+def test_convertir_fecha_misma_gramatica(dtype):
+    df = pd.DataFrame({"date": pd.Series(FECHAS, dtype=dtype)})
+    esperado = pd.to_datetime(pd.Series([
+        "2025-06-26", "2025-06-26 10:00:00", "2025-06-26 10:00:00", "2025-06-27",
+        "2025-06-26 10:00:00.250", None, None, None, None, None, None, None, None, None,
+    ], dtype=object), format="ISO8601").astype("datetime64[ns]").rename("date")
+    pd.testing.assert_series_equal(MotorPandas().convertir_fecha(df, "date"), esperado)
+    pd.testing.assert_series_equal(MotorPolars().convertir_fecha(df, "date"), esperado)
+
+
+def test_convertir_fecha_columna_datetime():
+    df = pd.DataFrame({"date": pd.to_datetime(["2025-06-26", None])})
+    pd.testing.assert_series_equal(MotorPandas().convertir_fecha(df, "date"), MotorPolars().convertir_fecha(df, "date"))
+
+
+@pytest.mark.parametrize("etapa, datos", [
+    ("listings", _listings),
+    ("calendar", _calendar),
+    ("reviews", _reviews),
+])
+def test_paridad_transformaciones(transf, etapa, datos):
+    df = datos()
+    resultados = {motor: getattr(t, f"transformaciones_{etapa}")(df) for motor, t in transf.items()}
+    pd.testing.assert_frame_equal(resultados["pandas"], resultados["polars"])
+    assert len(resultados["pandas"]) > 0
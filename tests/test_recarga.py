@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from carga import Cargas
+from recarga import RecargaSilver
+
+
+class _SQLFalso:
+    """Registra las llamadas de RecargaSilver en lugar de conectarse a SQL."""
+
+    def __init__(self):
+        self.preparadas = []
+        self.lotes = []
+
+    def prepare_table(self, df, table_name, schema="dbo"):
+        self.preparadas.append((table_name, list(df.columns)))
+        return True
+
+    def insert_chunk(self, df, table_name, schema="dbo"):
+        self.lotes.append(df)
+        return len(df)
+
+    def compactar_columnstore(self, table_name, schema="dbo"):
+        pass
+
+
+def _recargar(tmp_path, df):
+    Cargas(data_dir=str(tmp_path), logs_dir=str(tmp_path / "logs")).cargar_silver_parquet(df, "listings")
+    sql = _SQLFalso()
+    ok = RecargaSilver(sql, data_dir=str(tmp_path), logs_dir=str(tmp_path / "logs")).recargar("listings", "silver_listings")
+    return ok, sql
+
+
+def test_recarga_igual_a_carga_batch(tmp_path):
+    df = pd.DataFrame({
+        "id": [1, 2, 3],
+        "host_verifications": [["email", "phone"], [], ["phone"]],
+        "neighbourhood": ["Roma", None, "Coyoacán"],
+        "mixta": [1, "dos", np.nan],
+    }).astype({"neighbourhood": object})
+    ok, sql = _recargar(tmp_path, df)
+    assert ok
+    recargado = pd.concat(sql.lotes)
+    # La carga batch a tablas genéricas inserta df.astype(str)
+    assert recargado.astype(str).values.tolist() == df.astype(str).values.tolist()
+
+
+def test_parquet_sin_filas_vacia_la_tabla(tmp_path):
+    ok, sql = _recargar(tmp_path, pd.DataFrame({"id": pd.Series([], dtype="int64"), "price": pd.Series([], dtype="float64")}))
+    assert ok
+    assert sql.preparadas == [("silver_listings", ["id", "price"])]
+    assert sql.lotes == []
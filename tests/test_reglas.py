@@ -0,0 +1,15 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from motores import MotorPandas
+from reglas import MotorReglas
+
+
+def test_recortar_no_cuenta_nulos_como_rechazos():
+    motor = MotorReglas(MotorPandas(), logging.getLogger(__name__))
+    df = pd.DataFrame({"beds": [1.0, np.nan, 20.0, 5.0, np.nan]})
+    resultado = motor.ejecutar(df, [{"columna": "beds", "regla": "recortar", "minimo": 1, "maximo": 10}])
+    assert resultado["beds"].isna().sum() == 2
+    assert motor.ultimo_reporte["rechazos"].tolist() == [1]
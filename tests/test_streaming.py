@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from streaming import PipelineStreaming
+
+
+class _ExtraccionesFalsas:
+    def __init__(self, lotes):
+        self.lotes = lotes
+
+    def extraer_lotes(self, db_name, collection_name, query=None, tam_lote=50000):
+        yield from self.lotes
+
+
+class _SQLFalso:
+    def __init__(self):
+        self.lotes = []
+
+    def connect(self):
+        pass
+
+    def close(self):
+        pass
+
+    def prepare_table(self, df, table_name, schema="dbo"):
+        return True
+
+    def insert_chunk(self, df, table_name, schema="dbo"):
+        self.lotes.append(df)
+        return len(df)
+
+    def compactar_columnstore(self, table_name, schema="dbo"):
+        pass
+
+
+def _lote(dias):
+    return pd.DataFrame({
+        "listing_id": range(len(dias)),
+        "date": dias,
+        "available": "t",
+        "price": "$10.00",
+        "minimum_nights": 1,
+        "maximum_nights": 30,
+    })
+
+
+@pytest.mark.parametrize("motor", ["pandas", "polars"])
+def test_flujo_calendar_con_motor(motor):
+    if motor == "polars":
+        pytest.importorskip("polars")
+    sql = _SQLFalso()
+    lotes = [_lote(["2025-06-26", "2025-06-27"]), _lote(["2025-06-28", "abc"])]
+    pipeline = PipelineStreaming(_ExtraccionesFalsas(lotes), sql, workers=1, motor=motor)
+    resumen = pipeline.ejecutar("bi_mx", "calendar", "calendar", "silver_calendar")
+    assert resumen == {"lotes": 2, "filas": 4, "exito": True}
+    assert pd.concat(sql.lotes)["year"].isna().sum() == 1
+
+
+def test_flujo_reviews_enrutado_por_idioma(tmp_path):
+    pytest.importorskip("langdetect")
+    sql = _SQLFalso()
+    lote = pd.DataFrame({
+        "id": [1, 2],
+        "listing_id": [10, 11],
+        "date": ["2025-06-26", "2025-06-27"],
+        "reviewer_id": [100, 101],
+        "comments": ["El departamento estaba muy limpio y la ubicación es excelente", "ok"],
+    })
+    pipeline = PipelineStreaming(_ExtraccionesFalsas([lote]), sql, workers=1, idiomas=True, logs_dir=str(tmp_path))
+    resumen = pipeline.ejecutar("bi_mx", "reviews", "reviews", "silver_reviews")
+    assert resumen["exito"]
+    # Sin puntuador en español, ni el comentario en español ni el corto pasan por VADER
+    assert sql.lotes[0]["Sentimiento"].tolist() == ["No_Evaluado", "No_Evaluado"]